@@ -4,6 +4,7 @@ import io
 import csv
 import os.path
 import urllib.request
+from utils import graph_utils
 from model.network import Network
 from model.drug import Drug
 from model.gene import Gene
@@ -43,4 +44,4 @@ with io.open(file, 'r', encoding='utf-8', newline='') as f:
             rel['source'] += ',%s' % pubmed_ids
         network.add_edge(Edge(drug, gene, 'TARGETS', rel))
 
-network.save('../data/DGIdb/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/DGIdb'))
@@ -5,6 +5,7 @@ import urllib.request
 import gzip
 import io
 import csv
+from utils import graph_utils
 from model.network import Network
 from model.variant import Variant
 from model.disease import Disease
@@ -105,4 +106,4 @@ with io.open('../data/DisGeNet/curated_variant_disease_associations.tsv', 'r', e
             }
             network.add_edge(Edge(variant, disease, 'ASSOCIATES_WITH', rel))
 
-network.save('../data/DisGeNet/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/DisGeNet'))
@@ -6,6 +6,7 @@ import os.path
 import zipfile
 import lxml.etree as etree
 
+from utils import graph_utils
 from model.adr import AdverseDrugReaction
 from model.network import Network
 from model.drug import Drug
@@ -261,4 +262,4 @@ for row in snp_adrs_results:
     network.add_node(gene)
     network.add_edge(Edge(gene, adr, 'ASSOCIATED_WITH_ADR', {'source': 'DrugBank'}))
 
-network.save('../data/DrugBank/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/DrugBank'))
@@ -2,6 +2,7 @@
 
 import io
 import csv
+from utils import graph_utils
 from model.network import Network
 from model.drug import Drug
 from model.disease import Disease
@@ -37,4 +38,4 @@ with io.open('../data/DrugCentral/drugcentral_contraindications.csv', 'r', encod
         e = Edge(drug, disease, 'CONTRAINDICATES', {'source': 'DrugCentral'})
         network.add_edge(e)
 
-network.save('../data/DrugCentral/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/DrugCentral'))
@@ -5,6 +5,7 @@ import urllib.request
 import io
 import csv
 import re
+from utils import graph_utils
 from model.network import Network
 from model.gene import Gene
 from model.mirna import MiRNA
@@ -120,4 +121,4 @@ with io.open(file, 'r', encoding='utf-8', newline='') as f:
                     network.add_edge(e_go)
                     edge_source_target_lookup.append(mirna_rnacentral_id + '$' + go_id)
 
-network.save('../data/EBI-GOA-miRNA/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/EBI-GOA-miRNA'))
@@ -1,104 +1,255 @@
 #!/usr/bin/env python3
 
-import csv
 import io
 import os
 import json
-from typing import Dict
+import itertools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Iterator, Iterable, Callable, Tuple, Any
 
 import mondo_mapper
 
 from utils import name_utils
+from utils import hash_utils
+from utils import graph_utils
 from utils import directory_utils
+from utils.profiling import Profiler, measure
+from utils.csv_chunks import ChunkedCsvWriter
 
+from model.node import Node
+from model.edge import Edge
 from model.disease import Disease
 from model.network import Network
+from model.fusion_state import FusionState
+from model.network_cache import NetworkCache
+from model.sqlite_network import SqliteNetwork
+from model.snapshot import write_snapshot
 
+# Graphs are fused in this order, later nodes take precedence as canonical nodes
+graph_directories = [
+    '../data/EBI-GOA-miRNA',
+    '../data/miRTarBase',
+    '../data/RNAInter',
+    '../data/DisGeNet',
+    '../data/DrugBank',
+    '../data/DrugCentral',
+    '../data/GWAS-Catalog',
+    '../data/HGNC',
+    '../data/HPO',
+    '../data/MED-RT',
+    '../data/NDF-RT',
+    '../data/OMIM',
+    '../data/HuGE-Navigator',
+    '../data/SIDER',
+    '../data/DGIdb',
+    '../data/Westra_etal_2017',
+    '../data/SuperDrug2',
+    '../data/UniprotKB',
+    '../data/GO',
+    '../data/PharmGKB',
+    # '../data/PubMed',
+]
 
-def merge_duplicate_node_names(network: Network):
-    for node in network.nodes.values():
-        node.names = name_utils.normalize_node_names(node.names)
+# Number of nodes whose names are normalized at once
+NAME_BATCH_SIZE = 100000
+
+# Neo4j property columns of each exported relationship type and how their values are read from the edge attributes
+edge_metadata = {
+    'HAS_MOLECULAR_FUNCTION': [['source:string', 'pmid:string'], ['source', 'pmid']],  # pmid int now not string
+    'BELONGS_TO_BIOLOGICAL_PROCESS': [['source:string', 'pmid:string'], ['source', 'pmid']],
+    'IN_CELLULAR_COMPONENT': [['source:string', 'pmid:string'], ['source', 'pmid']],
+    'INDICATES': [['source:string'], ['source']],
+    'REGULATES': [['source:string', 'pmid:string'], ['source', 'pmid']],
+    'TRANSCRIBES': [['source:string'], ['source']],
+    'CONTRAINDICATES': [['source:string'], ['source']],
+    'INDUCES': [['source:string'], ['source']],
+    'CODES': [['source:string', 'pmid:int'], ['source', 'pmid']],
+    'EQTL': [
+        ['source:string', 'pvalue:string', 'snp_chr:string', 'cis_trans:string'],
+        ['source', 'pvalue', 'snp_chr', 'cis_trans']
+    ],
+    'INTERACTS': [['source:string', 'description:string'], ['source', 'description']],
+    'TARGETS': [
+        ['source:string', 'known_action:boolean', 'actions:string[]', 'simplified_action:string'],
+        [
+            'source',
+            lambda attr: ('true' if attr['known_action'] else 'false') if 'known_action' in attr else None,
+            lambda attr: ';'.join(attr['actions']),
+            'simplified_action'
+        ]
+    ],
+    'ASSOCIATES_WITH': [
+        ['source:string', 'num_pmids:int', 'num_snps:int', 'score:string'],
+        ['source', 'num_pmids', 'num_snps', 'score']
+    ],
+    'HAS_ADR': [['source:string'], ['source']],
+    'ASSOCIATED_WITH_ADR': [['source:string'], ['source']]
+}
+
+
+def merge_duplicate_node_names(network: Network, workers: int = 1) -> int:
+    # Each canonical node is visited once, nodes with a single name have nothing to merge. Nodes are normalized in
+    # batches, so a network stored on disk is never read into memory at once.
+    collapsed_count = 0
+    nodes = []
+    for node in network.get_nodes():
+        if len(node.names) > 1:
+            nodes.append(node)
+            if len(nodes) >= NAME_BATCH_SIZE:
+                collapsed_count += _merge_node_names(network, nodes, workers)
+                nodes = []
+    return collapsed_count + _merge_node_names(network, nodes, workers)
+
+
+def _merge_node_names(network: Network, nodes: List[Node], workers: int) -> int:
+    collapsed_count = 0
+    for node, names in zip(nodes, name_utils.normalize_node_names_many([x.names for x in nodes], workers)):
+        if len(names) < len(node.names):
+            collapsed_count += len(node.names) - len(names)
+            node.names = set(names)
+            network.update_node(node)
+    return collapsed_count
+
+
+def load_graph(graph: str, cache: NetworkCache or None = None) -> Network:
+    network = Network()
+    network.load(graph, cache=cache)
+    # Edges identical within a source stay identical after fusion, so they can already be dropped here
+    network.merge_duplicate_edges()
+    return network
+
+
+def load_measured_graph(graph: str, cache: NetworkCache or None = None) -> Tuple[Network, Dict[str, Any]]:
+    # Measured in the process loading the graph, which is a worker process with more than one fusion worker. The peak
+    # RSS is that of the worker, which may have loaded other graphs before.
+    with measure() as record:
+        network = load_graph(graph, cache)
+    record['nodes'] = network.get_node_count()
+    record['edges'] = network.get_edge_count()
+    record['pid'] = os.getpid()
+    return network, record
+
+
+def load_graphs(network: Network, graphs: List[str], workers: int, cache: NetworkCache or None = None,
+                profiler: Profiler or None = None):
+    profiler = profiler or Profiler()
+    # Results are merged in the order of the graphs to keep the node attribute precedence of a serial run
+    for graph, g in zip(graphs, iterate_graphs(graphs, workers, cache, profiler)):
+        print('[INFO] Add network', graph)
+        with profiler.merge_source(graph, network):
+            network.merge(g)
+
+
+def iterate_graphs(graphs: List[str], workers: int, cache: NetworkCache or None = None,
+                   profiler: Profiler or None = None) -> Iterator[Network]:
+    profiler = profiler or Profiler()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(graphs) > 1 else None
+    if executor is not None:
+        results = executor.map(load_measured_graph, graphs, itertools.repeat(cache))
+    else:
+        results = (load_measured_graph(graph, cache) for graph in graphs)
+    try:
+        for graph, (g, record) in zip(graphs, results):
+            profiler.add_source(graph, record)
+            yield g
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def load_graphs_incremental(graphs: List[str], workers: int, state_path: str,
+                            cache: NetworkCache or None = None, profiler: Profiler or None = None) -> Network:
+    state = FusionState.load(state_path) or FusionState()
+    manifest = [(graph, cache.get_fingerprint(graph)['hash'] if cache is not None else hash_utils.get_file_hash(graph))
+                for graph in graphs]
+    changed_graphs, modified = state.update(manifest, lambda x: iterate_graphs(x, workers, cache, profiler))
+    for graph in changed_graphs:
+        print('[INFO] Add network', graph)
+    print('[INFO] Reused %s unchanged networks' % (len(graphs) - len(changed_graphs)))
+    # The state holds a copy of the whole fused network, it is only written again if any graph changed
+    if modified:
+        state.save(state_path)
+    return state.network
+
+
+def create_network(config: Dict) -> Network:
+    if 'network-backend' in config and config['network-backend'] == 'sqlite':
+        database_path = config['network-database-path']
+        if os.path.exists(database_path):
+            os.remove(database_path)
+        directory = os.path.dirname(database_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        return SqliteNetwork(database_path)
+    return Network()
+
+
+def write_node_file(output_path: str, name: str, nodes: Iterable[Node], attribute_keys: List[str],
+                    compress: bool = False, max_size: int = 0) -> str:
+    header = (['label_id:ID(Node-ID)', '_id:string', 'ids:string[]', 'names:string[]'] +
+              ['%s:string' % x for x in attribute_keys] + [':LABEL'])
+    with ChunkedCsvWriter(output_path, name, header, compress, max_size) as writer:
+        for n in nodes:
+            row = [n.label_id, n.id, ';'.join(n.ids), ';'.join(n.names)]
+            for key in attribute_keys:
+                row.append(n.attributes[key] if key in n.attributes else None)
+            row.append(n.label)
+            writer.writerow(row)
+    return writer.import_argument
+
+
+def get_attribute_getters(metadata: List[List]) -> List[Callable[[Dict[str, Any]], Any]]:
+    # Attribute names are turned into getters once, so each row is built by a plain loop over the getters
+    return [l if isinstance(l, type(lambda: 0)) else lambda attr, key=l: attr[key] if key in attr else None
+            for l in metadata[1]]
+
+
+def write_relationship_file(output_path: str, name: str, edges: Iterable[Tuple[Edge, str, str]], metadata: List[List],
+                            compress: bool = False, max_size: int = 0) -> str:
+    # Edges are given with the label ids of the canonical nodes of their endpoints
+    getters = get_attribute_getters(metadata)
+    header = [':START_ID(Node-ID)'] + metadata[0] + [':END_ID(Node-ID)', ':TYPE']
+    with ChunkedCsvWriter(output_path, name, header, compress, max_size) as writer:
+        for e, source_label_id, target_label_id in edges:
+            writer.writerow([source_label_id] + [getter(e.attributes) for getter in getters] +
+                            [target_label_id, e.label])
+    return writer.import_argument
+
+
+def get_constraint_queries(network: Network) -> List[str]:
+    unique_labels = set()
+    for node_label in network.node_labels():
+        unique_labels.update(set(node_label.split(';')))
+    return ['create constraint on (p:%s) assert p._id is unique' % x for x in unique_labels]
 
 
 def save_network(network: Network, config: Dict):
     output_path = config['output-path']
-    # Save nodes
-    node_import_files = []
-    for label in network.node_labels():
-        file_name = 'nodes_%s.csv' % label.replace(';', '_')
-        nodes = set(network.get_nodes_by_label(label))
-        if len(nodes) > 0:
-            node_import_files.append(file_name)
-            with io.open(os.path.join(output_path, file_name), 'w', encoding='utf-8', newline='') as f:
-                writer = csv.writer(f, delimiter=',', quotechar='"')
-                all_attribute_keys = set()
-                for n in nodes:
-                    all_attribute_keys.update(n.attributes.keys())
-                all_attribute_keys = sorted(all_attribute_keys)
-                writer.writerow(
-                    ['label_id:ID(Node-ID)', '_id:string', 'ids:string[]', 'names:string[]'] +
-                    ['%s:string' % x for x in all_attribute_keys] + [':LABEL'])
-                for n in nodes:
-                    row = [n.label_id, n.id, ';'.join(n.ids), ';'.join(n.names)]
-                    for key in all_attribute_keys:
-                        row.append(n.attributes[key] if key in n.attributes else None)
-                    row.append(n.label)
-                    writer.writerow(row)
-
-    edge_metadata = {
-        'HAS_MOLECULAR_FUNCTION': [['source:string', 'pmid:string'], ['source', 'pmid']],  # pmid int now not string
-        'BELONGS_TO_BIOLOGICAL_PROCESS': [['source:string', 'pmid:string'], ['source', 'pmid']],
-        'IN_CELLULAR_COMPONENT': [['source:string', 'pmid:string'], ['source', 'pmid']],
-        'INDICATES': [['source:string'], ['source']],
-        'REGULATES': [['source:string', 'pmid:string'], ['source', 'pmid']],
-        'TRANSCRIBES': [['source:string'], ['source']],
-        'CONTRAINDICATES': [['source:string'], ['source']],
-        'INDUCES': [['source:string'], ['source']],
-        'CODES': [['source:string', 'pmid:int'], ['source', 'pmid']],
-        'EQTL': [
-            ['source:string', 'pvalue:string', 'snp_chr:string', 'cis_trans:string'],
-            ['source', 'pvalue', 'snp_chr', 'cis_trans']
-        ],
-        'INTERACTS': [['source:string', 'description:string'], ['source', 'description']],
-        'TARGETS': [
-            ['source:string', 'known_action:boolean', 'actions:string[]', 'simplified_action:string'],
-            [
-                'source',
-                lambda attr: ('true' if attr['known_action'] else 'false') if 'known_action' in attr else None,
-                lambda attr: ';'.join(attr['actions']),
-                'simplified_action'
-            ]
-        ],
-        'ASSOCIATES_WITH': [
-            ['source:string', 'num_pmids:int', 'num_snps:int', 'score:string'],
-            ['source', 'num_pmids', 'num_snps', 'score']
-        ],
-        'HAS_ADR': [['source:string'], ['source']],
-        'ASSOCIATED_WITH_ADR': [['source:string'], ['source']]
-    }
-
-    # Save relationships
-    for x in edge_metadata:
-        with io.open(os.path.join(output_path, 'rel_%s.csv' % x), 'w', encoding='utf-8', newline='') as f:
-            writer = csv.writer(f, delimiter=',', quotechar='"')
-            writer.writerow([':START_ID(Node-ID)'] + edge_metadata[x][0] + [':END_ID(Node-ID)', ':TYPE'])
-            for e in network.get_edges_by_label(x):
-                values = []
-                for l in edge_metadata[x][1]:
-                    if isinstance(l, type(lambda: 0)):
-                        values.append(l(e.attributes))
-                    else:
-                        values.append(e.attributes[l] if l in e.attributes else None)
-                source_id = network.get_node_by_id(e.source_node_id, e.source_node_label).label_id
-                target_id = network.get_node_by_id(e.target_node_id, e.target_node_label).label_id
-                writer.writerow([source_id] + values + [target_id, e.label])
+    # Gzip compression and size capped chunks are optional, by default a single plain csv file is written per label
+    compress = config['export-compress'] if 'export-compress' in config else False
+    max_size = config['export-chunk-size'] if 'export-chunk-size' in config else 0
+    # Save nodes, grouped by each part of their label. As before, files are only written for labels listed by
+    # node_labels, multi labels never match a single part. The nodes of each file are read label by label, so the
+    # sqlite backend streams them from the store.
+    node_labels = [x for x in network.node_labels() if ';' not in x]
+    export_workers = config['export-workers'] if 'export-workers' in config else 1
+    with ThreadPoolExecutor(max_workers=max(export_workers, 1)) as executor:
+        node_import_files = list(executor.map(lambda x: write_node_file(
+            output_path, 'nodes_%s' % x, network.iterate_nodes_by_label(x), network.get_node_attribute_keys(x),
+            compress, max_size), node_labels))
+
+    # Save relationships. Edge endpoints are resolved to their canonical nodes while the edges are read.
+    relationship_files = [(output_path, 'rel_%s' % x, network.iterate_resolved_edges(x), edge_metadata[x], compress,
+                           max_size) for x in edge_metadata]
+    with ThreadPoolExecutor(max_workers=max(export_workers, 1)) as executor:
+        relationship_arguments = dict(zip(edge_metadata, executor.map(lambda x: write_relationship_file(*x),
+                                                                       relationship_files)))
+    relationship_import_files = [relationship_arguments[x] if x in relationship_arguments else 'rel_%s.csv' % x
+                                 for x in network.edge_labels()]
 
     with io.open(os.path.join(output_path, 'create_indices.cypher'), 'w', encoding='utf-8', newline='') as f:
-        unique_labels = set()
-        for node_label in network.node_labels():
-            unique_labels.update(set(node_label.split(';')))
-        for node_label in unique_labels:
-            f.write('create constraint on (p:%s) assert p._id is unique;\n' % node_label)
+        for query in get_constraint_queries(network):
+            f.write('%s;\n' % query)
     with io.open(os.path.join(output_path, 'import_admin.bat'), 'w', encoding='utf-8', newline='') as f:
         f.write('@echo off\n')
         f.write('net stop neo4j\n')
@@ -107,7 +258,7 @@ def save_network(network: Network, config: Dict):
         f.write(' import ' +
                 '--database %s ' % config['Neo4j']['database-name'] +
                 ' '.join(['--nodes %s' % x for x in node_import_files]) + ' ' +
-                ' '.join(['--relationships rel_%s.csv' % x for x in network.edge_labels()]) +
+                ' '.join(['--relationships %s' % x for x in relationship_import_files]) +
                 ' > import.log\n')
         f.write('net start neo4j\n')
         f.write(os.path.join(config['Neo4j']['bin-path'], 'cypher-shell'))
@@ -118,7 +269,7 @@ def save_network(network: Network, config: Dict):
         f.write(' import ' +
                 '--database %s ' % config['Neo4j']['database-name'] +
                 ' '.join(['--nodes %s' % x for x in node_import_files]) + ' ' +
-                ' '.join(['--relationships rel_%s.csv' % x for x in network.edge_labels()]) +
+                ' '.join(['--relationships %s' % x for x in relationship_import_files]) +
                 ' > import.log\n')
 
 
@@ -126,57 +277,61 @@ if __name__ == '__main__':
     with io.open('../data/config.json', 'r', encoding='utf-8', newline='') as f:
         config = json.load(f)
 
-    network = Network()
-    # Import
-    graphs = [
-        '../data/EBI-GOA-miRNA/graph.json',
-        '../data/miRTarBase/graph.json',
-        '../data/RNAInter/graph.json',
-        '../data/DisGeNet/graph.json',
-        '../data/DrugBank/graph.json',
-        '../data/DrugCentral/graph.json',
-        '../data/GWAS-Catalog/graph.json',
-        '../data/HGNC/graph.json',
-        '../data/HPO/graph.json',
-        '../data/MED-RT/graph.json',
-        '../data/NDF-RT/graph.json',
-        '../data/OMIM/graph.json',
-        '../data/HuGE-Navigator/graph.json',
-        '../data/SIDER/graph.json',
-        '../data/DGIdb/graph.json',
-        '../data/Westra_etal_2017/graph.json',
-        '../data/SuperDrug2/graph.json',
-        '../data/UniprotKB/graph.json',
-        '../data/GO/graph.json',
-        '../data/PharmGKB/graph.json',
-        # '../data/PubMed/graph.json',
-    ]
+    profiler = Profiler(config['profile-memory'] if 'profile-memory' in config else False)
     # Fusion
     print('[INFO] Network fusion')
-    for graph in graphs:
-        print('[INFO] Add network', graph)
-        with io.open(graph, 'r', encoding='utf-8', newline='') as f:
-            g = json.loads(f.read())
-            network.load_from_dict(g)
-    # Mapping
-    print('[INFO] Add disease mappings')
-    all_disease_ids = set()
-    for node in network.get_nodes_by_label('Disease'):
-        all_disease_ids.update(node.ids)
-    for disease_id in all_disease_ids:
-        mapped_ids, mapped_names = mondo_mapper.map_from(disease_id)
-        if mapped_ids:
-            network.add_node(Disease(mapped_ids, mapped_names))
-    # Cleanup
-    print('[INFO] Prune network')
-    network.prune()
-    print('[INFO] Merge duplicate node names')
-    merge_duplicate_node_names(network)
-    print('[INFO] Merge duplicate edges')
-    network.merge_duplicate_edges()
-    # Export
-    print('[INFO] Export network')
-    directory_utils.create_clean_directory(config['output-path'])
-    with io.open(os.path.join(config['output-path'], 'graph.json'), 'w', encoding='utf-8', newline='') as f:
-        f.write(json.dumps(network.to_dict(), separators=(',', ':')))
-    save_network(network, config)
+    fusion_workers = config['fusion-workers'] if 'fusion-workers' in config else 1
+    graphs = [graph_utils.find_graph_file_path(x) for x in graph_directories]
+    fusion_workers = fusion_workers if fusion_workers > 0 else os.cpu_count()
+    network_cache = NetworkCache.from_config(config)
+    network = None
+    try:
+        with profiler.stage('load') as stage_record:
+            # The persisted fusion state holds the in-memory network, so it is only used with the memory backend
+            if 'fusion-state-path' in config and config['fusion-state-path'] and (
+                    'network-backend' not in config or config['network-backend'] == 'memory'):
+                network = load_graphs_incremental(graphs, fusion_workers, config['fusion-state-path'], network_cache,
+                                                  profiler)
+            else:
+                network = create_network(config)
+                load_graphs(network, graphs, fusion_workers, network_cache, profiler)
+            stage_record['nodes'] = network.get_node_count()
+            stage_record['edges'] = network.get_edge_count()
+        # Mapping
+        print('[INFO] Add disease mappings')
+        with profiler.stage('mondo_mapping', network):
+            all_disease_ids = set()
+            for node in network.iterate_nodes_by_label('Disease'):
+                all_disease_ids.update(node.ids)
+            # One disease per equivalence class merges the same nodes as adding the mapping of every single id
+            for mapped_ids, mapped_names in mondo_mapper.map_many(all_disease_ids):
+                network.add_node(Disease(mapped_ids, mapped_names))
+        # Cleanup
+        print('[INFO] Prune network')
+        with profiler.stage('prune', network):
+            network.prune()
+        print('[INFO] Merge duplicate node names')
+        with profiler.stage('merge_node_names', network) as stage_record:
+            collapsed_name_count = merge_duplicate_node_names(network, fusion_workers)
+            stage_record['collapsed_names'] = collapsed_name_count
+        print('[INFO] Collapsed %s duplicate node names' % collapsed_name_count)
+        print('[INFO] Merge duplicate edges')
+        with profiler.stage('merge_duplicate_edges', network) as stage_record:
+            removed_edge_counts = network.merge_duplicate_edges()
+            stage_record['removed_edges'] = removed_edge_counts
+        for label in sorted(removed_edge_counts.keys()):
+            print('[INFO] Removed %s duplicate %s edges' % (removed_edge_counts[label], label))
+        # Export
+        print('[INFO] Export network')
+        with profiler.stage('export', network):
+            directory_utils.create_clean_directory(config['output-path'])
+            network.save(graph_utils.get_graph_file_path(config['output-path']), compact=True)
+            # The snapshot is built in memory, which the sqlite backend is meant to avoid
+            if not isinstance(network, SqliteNetwork):
+                write_snapshot(network, os.path.join(config['output-path'], 'graph.snapshot'))
+            save_network(network, config)
+        profiler.save(os.path.join(config['output-path'], 'profile.json'))
+    finally:
+        # The sqlite backend is committed and closed, also when a stage fails
+        if network is not None:
+            network.close()
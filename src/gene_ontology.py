@@ -7,6 +7,7 @@ import io
 import csv
 import xml.etree.ElementTree
 
+from utils import graph_utils
 from model.edge import Edge
 from model.network import Network
 from model.gene import Gene
@@ -72,4 +73,4 @@ with io.open(annotations_file, 'r', encoding='utf-8', newline='') as f:
             e = Edge(gene, network.get_node_by_id(row[4], 'GOClass'), label, {'source': 'GO,%s' % row[5]})
             network.add_edge(e)
 
-network.save('../data/GO/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/GO'))
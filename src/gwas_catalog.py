@@ -6,6 +6,7 @@ import csv
 import cgi
 import os.path
 import urllib.request
+from utils import graph_utils
 from model.network import Network
 from model.variant import Variant
 from model.gene import Gene
@@ -80,4 +81,4 @@ with io.open(file, 'r', encoding='utf-8', newline='') as f:
                 network.add_node(variant)
                 network.add_edge(Edge(gene, variant, 'CODES', {'source': 'GWASCatalog', 'pmid': row[1]}))
 
-network.save('../data/GWAS-Catalog/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/GWAS-Catalog'))
@@ -4,6 +4,7 @@ import os.path
 import urllib.request
 import io
 import csv
+from utils import graph_utils
 from model.network import Network
 from model.gene import Gene
 
@@ -28,4 +29,4 @@ with io.open(file, 'r', encoding='utf-8', newline='') as f:
             gene_ids.append(row[0])
         network.add_node(Gene(gene_ids, [row[2]]))
 
-network.save('../data/HGNC/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/HGNC'))
@@ -4,6 +4,7 @@ import os.path
 import urllib.request
 import io
 import csv
+from utils import graph_utils
 from model.network import Network
 from model.disease import Disease
 from model.gene import Gene
@@ -31,4 +32,4 @@ with io.open(file, 'r', encoding='utf-8', newline='') as f:
         hpo_term_name = row[4]
         # TODO
 
-network.save('../data/HPO/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/HPO'))
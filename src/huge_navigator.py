@@ -5,6 +5,7 @@ import os
 import urllib.request
 import urllib.parse
 
+from utils import graph_utils
 from model.edge import Edge
 from model.network import Network
 from model.gene import Gene
@@ -35,4 +36,4 @@ with io.open(file, 'r', encoding='utf-8', newline='') as f:
                 rel = {'source': 'HuGE Navigator'}
                 network.add_edge(Edge(gene, disease, 'ASSOCIATES_WITH', rel))
 
-network.save('../data/HuGE-Navigator/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/HuGE-Navigator'))
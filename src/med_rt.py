@@ -5,6 +5,7 @@ import xml.etree.ElementTree
 import urllib.request
 import zipfile
 import re
+from utils import graph_utils
 from model.network import Network
 from model.drug import Drug
 from model.disease import Disease
@@ -69,4 +70,4 @@ for association in root.findall('association'):
     elif association_type == 'may_treat':
         network.add_edge(Edge(drug, disease, 'INDICATES', rel))
 
-network.save('../data/MED-RT/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/MED-RT'))
@@ -5,6 +5,7 @@ import urllib.request
 import io
 import csv
 import xlrd
+from utils import graph_utils
 from model.network import Network
 from model.gene import Gene
 from model.mirna import MiRNA
@@ -61,4 +62,4 @@ for rownum in range(sh.nrows):
                         network.add_edge(e)
                         edge_source_target_lookup.append(mirna_rnacentral_id + '$' + gene_hgnc_id)
                     break
-network.save('../data/miRTarBase/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/miRTarBase'))
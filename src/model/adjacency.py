@@ -0,0 +1,80 @@
+import bisect
+from array import array
+from typing import List, Dict, Tuple
+
+from model.node import Node
+
+OUTGOING = 'out'
+INCOMING = 'in'
+
+
+class AdjacencyIndex:
+    def __init__(self, nodes: List[Node], edge_endpoints: Dict[str, Tuple[array, array]]):
+        self.nodes = nodes
+        self.node_indices: Dict[Node, int] = {node: i for i, node in enumerate(nodes)}
+        # Compressed sparse rows per edge label and direction. The neighbors of node i are
+        # targets[offsets[i]:offsets[i + 1]], sorted ascending to allow binary search.
+        self.rows: Dict[Tuple[str, str], Tuple[array, array]] = {}
+        for label in edge_endpoints:
+            sources, targets = edge_endpoints[label]
+            self.rows[(label, OUTGOING)] = self._compress(sources, targets)
+            self.rows[(label, INCOMING)] = self._compress(targets, sources)
+
+    def _compress(self, rows: array, columns: array) -> Tuple[array, array]:
+        offsets = array('q', [0]) * (len(self.nodes) + 1)
+        for row in rows:
+            offsets[row + 1] += 1
+        for i in range(1, len(offsets)):
+            offsets[i] += offsets[i - 1]
+        targets = array('q', [0]) * len(columns)
+        positions = array('q', offsets)
+        for row, column in zip(rows, columns):
+            targets[positions[row]] = column
+            positions[row] += 1
+        for i in range(0, len(self.nodes)):
+            start = offsets[i]
+            end = offsets[i + 1]
+            if end - start > 1:
+                targets[start:end] = array('q', sorted(targets[start:end]))
+        return offsets, targets
+
+    def edge_labels(self) -> List[str]:
+        return sorted({label for label, _ in self.rows})
+
+    def index_of(self, node: Node) -> int or None:
+        return self.node_indices.get(node)
+
+    def neighbor_indices(self, index: int, label: str, direction: str = OUTGOING) -> array:
+        if (label, direction) not in self.rows:
+            return array('q')
+        offsets, targets = self.rows[(label, direction)]
+        return targets[offsets[index]:offsets[index + 1]]
+
+    def neighbors(self, node: Node, label: str, direction: str = OUTGOING) -> List[Node]:
+        index = self.index_of(node)
+        if index is None:
+            return []
+        return [self.nodes[x] for x in self.neighbor_indices(index, label, direction)]
+
+    def degrees(self, label: str, direction: str = OUTGOING) -> array:
+        if (label, direction) not in self.rows:
+            return array('q', [0]) * len(self.nodes)
+        offsets, _ = self.rows[(label, direction)]
+        return array('q', [offsets[i + 1] - offsets[i] for i in range(0, len(self.nodes))])
+
+    def degree(self, node: Node, label: str, direction: str = OUTGOING) -> int:
+        index = self.index_of(node)
+        if index is None or (label, direction) not in self.rows:
+            return 0
+        offsets, _ = self.rows[(label, direction)]
+        return offsets[index + 1] - offsets[index]
+
+    def has_edge(self, node_from: Node, node_to: Node, label: str) -> bool:
+        source = self.index_of(node_from)
+        target = self.index_of(node_to)
+        if source is None or target is None or (label, OUTGOING) not in self.rows:
+            return False
+        offsets, targets = self.rows[(label, OUTGOING)]
+        end = offsets[source + 1]
+        position = bisect.bisect_left(targets, target, offsets[source], end)
+        return position < end and targets[position] == target
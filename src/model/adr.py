@@ -2,6 +2,9 @@ from model.node import Node
 
 
 class AdverseDrugReaction(Node):
+    __slots__ = ()
+    bulk_prefix = 'GenCoNet'
+
     def __init__(self, ids: [str], names: [str]):
         super().__init__(ids, names)
         self.primary_id_prefix = 'GenCoNet'
@@ -4,11 +4,18 @@ from model.node import Node
 
 
 class Edge:
+    __slots__ = ('source_node_id', 'source_node_label', 'target_node_id', 'target_node_label', 'label', 'attributes',
+                 '_id', '_source_label_id', '_target_label_id')
     internal_id_counter = 1
 
-    def __init__(self, source_node: Node, target_node: Node or Tuple[str, str], label: str, attributes: Dict[str, Any]):
-        self.source_node_id = source_node.id
-        self.source_node_label = source_node.label
+    def __init__(self, source_node: Node or Tuple[str, str], target_node: Node or Tuple[str, str], label: str,
+                 attributes: Dict[str, Any]):
+        if isinstance(source_node, Node):
+            self.source_node_id = source_node.id
+            self.source_node_label = source_node.label
+        else:
+            self.source_node_id = source_node[0]
+            self.source_node_label = source_node[1]
         if isinstance(target_node, Node):
             self.target_node_id = target_node.id
             self.target_node_label = target_node.label
@@ -17,20 +24,33 @@ class Edge:
             self.target_node_label = target_node[1]
         self.label = label
         self.attributes = attributes
-        self._id = Edge.internal_id_counter
-        Edge.internal_id_counter += 1
+        self.renew_id()
+        self._source_label_id: str or None = None
+        self._target_label_id: str or None = None
 
     @property
     def id(self) -> int:
         return self._id
 
+    def renew_id(self):
+        self._id = Edge.internal_id_counter
+        Edge.internal_id_counter += 1
+
+    @staticmethod
+    def advance_id_counter(last_id: int):
+        Edge.internal_id_counter = max(Edge.internal_id_counter, last_id + 1)
+
     @property
     def source_label_id(self) -> str:
-        return '%s|%s' % (self.source_node_label, self.source_node_id)
+        if self._source_label_id is None:
+            self._source_label_id = '%s|%s' % (self.source_node_label, self.source_node_id)
+        return self._source_label_id
 
     @property
     def target_label_id(self) -> str:
-        return '%s|%s' % (self.target_node_label, self.target_node_id)
+        if self._target_label_id is None:
+            self._target_label_id = '%s|%s' % (self.target_node_label, self.target_node_id)
+        return self._target_label_id
 
     def __str__(self) -> str:
         return 'Edge={label: %s, source: %s, target: %s}' % (self.label, self.source_label_id, self.target_label_id)
@@ -0,0 +1,111 @@
+import io
+import os
+import pickle
+from typing import List, Dict, Iterable, Set, Tuple, Callable
+
+from model.node import Node
+from model.edge import Edge
+from model.network import Network
+
+# Increase whenever the pickled state changes in an incompatible way
+STATE_VERSION = 1
+
+
+class FusionState:
+    def __init__(self):
+        self.network = Network()
+        # Graph file paths in fusion order with the content hash they were applied with
+        self.manifest: List[Tuple[str, str]] = []
+        # Provenance of every applied graph, the label ids of its nodes and the ids of its edges in the network
+        self.label_ids: Dict[str, Set[str]] = {}
+        self.edge_ids: Dict[str, List[int]] = {}
+
+    @staticmethod
+    def load(file_path: str) -> 'FusionState' or None:
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with io.open(file_path, 'rb') as f:
+                version, state = pickle.load(f)
+        except Exception as e:
+            print('[WARN] Failed to read fusion state %s: %s' % (file_path, e))
+            return None
+        if version != STATE_VERSION:
+            return None
+        # Edges created later in this process must not reuse the ids of the persisted edges
+        Edge.advance_id_counter(max(state.network.edges.keys(), default=0))
+        return state
+
+    def save(self, file_path: str):
+        directory = os.path.dirname(file_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_file_path = '%s.%s.tmp' % (file_path, os.getpid())
+        with io.open(temp_file_path, 'wb') as f:
+            pickle.dump((STATE_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file_path, file_path)
+
+    def update(self, manifest: List[Tuple[str, str]],
+               load_graphs: Callable[[List[str]], Iterable[Network]]) -> Tuple[List[str], bool]:
+        # Returns the graphs that had to be applied again and whether the state changed at all, in which case it has
+        # to be saved again. Graphs are loaded through the callback, which gets the list of graph file paths and
+        # yields their networks in the same order.
+        modified = list(manifest) != self.manifest
+        graphs = [graph for graph, _ in manifest]
+        known_hashes = dict(self.manifest)
+        kept_graphs = [graph for graph, _ in self.manifest if graph in graphs]
+        if kept_graphs != [graph for graph in graphs if graph in known_hashes]:
+            # Reordered graphs change the node attribute precedence, which requires a full rebuild
+            self.__init__()
+            known_hashes = {}
+        changed = [graph for graph, file_hash in manifest if known_hashes.get(graph) != file_hash]
+        removed = [graph for graph, _ in self.manifest if graph not in graphs]
+        if not known_hashes:
+            for graph, network in zip(graphs, load_graphs(graphs)):
+                self._apply(graph, network)
+        elif changed or removed:
+            self._reapply(graphs, changed, removed, load_graphs)
+        self.manifest = list(manifest)
+        return changed, modified
+
+    def _reapply(self, graphs: List[str], changed: List[str], removed: List[str],
+                 load_graphs: Callable[[List[str]], Iterable[Network]]):
+        # Drop the old contribution of every changed graph: its edges and all identity sets it took part in
+        label_ids = set()
+        for graph in changed + removed:
+            if graph in self.edge_ids:
+                self.network.delete_edges([self.network.edges[x] for x in self.edge_ids.pop(graph)
+                                           if x in self.network.edges])
+                label_ids.update(self.label_ids.pop(graph))
+        networks = dict(zip(changed, load_graphs(changed)))
+        for graph in changed:
+            label_ids.update(self._get_label_ids(networks[graph].get_nodes()))
+        label_ids.update(self.network.detach_nodes(label_ids))
+        # The removed sets are rebuilt from the nodes of all graphs touching them in fusion order, so canonical nodes
+        # and merged names are the same as in a full fusion
+        touching = [graph for graph in graphs
+                    if graph not in networks and not self.label_ids[graph].isdisjoint(label_ids)]
+        networks.update(zip(touching, load_graphs(touching)))
+        for graph in graphs:
+            if graph in changed:
+                self._apply(graph, networks[graph])
+            elif graph in networks:
+                for node in networks[graph].get_nodes():
+                    if not label_ids.isdisjoint(self._get_label_ids([node])):
+                        self.network.add_node(node)
+
+    def _apply(self, graph: str, network: Network):
+        self.label_ids[graph] = self._get_label_ids(network.get_nodes())
+        self.edge_ids[graph] = []
+        for node in network.get_nodes():
+            self.network.add_node(node)
+        for edge in network.get_edges():
+            # Edge ids are only unique per process, the network may have been built elsewhere
+            edge.renew_id()
+            self.network.add_edge(edge)
+            self.edge_ids[graph].append(edge.id)
+        network.clear()
+
+    @staticmethod
+    def _get_label_ids(nodes: Iterable[Node]) -> Set[str]:
+        return {'%s|%s' % (node.label, _id) for node in nodes for _id in node.ids}
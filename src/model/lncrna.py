@@ -2,6 +2,9 @@ from model.rna import RNA
 
 
 class LncRNA(RNA):
+    __slots__ = ()
+    bulk_prefix = 'URS'
+
     def __init__(self, ids: [str], names: [str]):
         super().__init__(ids, names)
         self.primary_id_prefix = 'URS'
\ No newline at end of file
@@ -2,6 +2,9 @@ from model.rna import RNA
 
 
 class MRNA(RNA):
+    __slots__ = ()
+    bulk_prefix = 'HGNC'
+
     def __init__(self, ids: [str], names: [str]):
         super().__init__(ids, names)
         self.primary_id_prefix = 'HGNC'
\ No newline at end of file
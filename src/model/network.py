@@ -1,59 +1,161 @@
 import io
 import json
+import itertools
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from model.adjacency import AdjacencyIndex
 from model.node import Node
 from model.edge import Edge
-from model.circrna import CircRNA
-from model.erna import ERNA
-from model.lncrna import LncRNA
-from model.mirna import MiRNA
-from model.mrna import MRNA
-from model.ncrna import NcRNA
-from model.pirna import PiRNA
-from model.pseudogene import Pseudogene
-from model.ribozyme import Ribozyme
-from model.rna import RNA
-from model.rrna import RRNA
-from model.scarna import ScaRNA
-from model.scrna import ScRNA
-from model.snorna import SnoRNA
-from model.snrna import SnRNA
-from typing import List, Dict, Iterator
+from model.network_cache import NetworkCache
+from model import registry
+from utils import json_stream
+from utils.intern_table import InternTable
+from utils.union_find import UnionFind
+from typing import List, Dict, Iterator, Iterable, Set, Tuple, Any, TextIO
+
+# Number of node records created at once while streaming a graph file
+NODE_BATCH_SIZE = 10000
 
 
 class Network:
     def __init__(self):
-        self.nodes: Dict[str, Node] = {}
+        self.clear()
+
+    def clear(self):
+        self._label_ids = InternTable()
+        self._identity = UnionFind()
+        self._canonical_nodes: Dict[int, Node] = {}
+        self._pending_merges: Dict[int, List[Node]] = {}
+        self._nodes: Dict[str, Node] or None = None
+        self._label_roots: Dict[str, Set[int]] = {}
+        self._labels_by_part: Dict[str, Set[str]] = {}
         self.edges: Dict[int, Edge] = {}
         self.edge_lookup: Dict[str, Dict[int, Edge]] = {}
-        self.edge_source_lookup: Dict[str, Dict[int, Edge]] = {}
-        self.edge_target_lookup: Dict[str, Dict[int, Edge]] = {}
+        self.edge_source_lookup: Dict[int, Dict[int, Edge]] = {}
+        self.edge_target_lookup: Dict[int, Dict[int, Edge]] = {}
+
+    @property
+    def nodes(self) -> Dict[str, Node]:
+        if self._nodes is None:
+            self._nodes = {self._label_ids.lookup(x): self._get_canonical_node(self._identity.find(x))
+                           for x in self._identity}
+        return self._nodes
 
     def add_node(self, node: Node):
-        label_ids = [self.get_node_label_id(node, _id) for _id in node.ids]
-        matches = [self.nodes[x] for x in label_ids if x in self.nodes]
-        for match in matches:
-            node.merge(match)
-        label_ids = [self.get_node_label_id(node, _id) for _id in node.ids]
-        for x in label_ids:
-            self.nodes[x] = node
+        label = node.label
+        label_ids = [self._label_ids.intern('%s|%s' % (label, _id)) for _id in node.ids]
+        if not label_ids:
+            return
+        matched_roots = {self._identity.find(x) for x in label_ids if x in self._identity}
+        root = self._identity.add(label_ids[0])
+        for x in label_ids[1:]:
+            self._identity.add(x)
+            root = self._identity.union(root, x)
+        # The matched nodes are only queued here and merged once when the canonical node is requested
+        if label not in self._label_roots:
+            self._label_roots[label] = set()
+            for part in label.split(';'):
+                if part not in self._labels_by_part:
+                    self._labels_by_part[part] = set()
+                self._labels_by_part[part].add(label)
+        label_roots = self._label_roots[label]
+        pending = []
+        for matched_root in matched_roots:
+            label_roots.discard(matched_root)
+            matched_pending = self._pending_merges.pop(matched_root, [])
+            matched_pending.append(self._canonical_nodes.pop(matched_root))
+            if len(matched_pending) > len(pending):
+                pending, matched_pending = matched_pending, pending
+            pending.extend(matched_pending)
+        self._canonical_nodes[root] = node
+        label_roots.add(root)
+        if pending:
+            self._pending_merges[root] = pending
+        self._nodes = None
+
+    def merge(self, other: 'Network'):
+        # Nodes and edges are moved without copying, so the other network is emptied afterwards
+        for node in other.get_nodes():
+            self.add_node(node)
+        for edge in other.get_edges():
+            # Edge ids are only unique per process, the other network may have been built elsewhere
+            edge.renew_id()
+            self.add_edge(edge)
+        other.clear()
+
+    def _get_canonical_node(self, root: int) -> Node:
+        node = self._canonical_nodes[root]
+        if root in self._pending_merges:
+            node.merge_many(self._pending_merges.pop(root))
+        return node
+
+    def _get_label_id_indices(self, node: Node) -> List[int]:
+        label = node.label
+        label_ids = [self._label_ids.get('%s|%s' % (label, _id)) for _id in node.ids]
+        return [x for x in label_ids if x is not None]
+
+    def _get_root(self, label_id: str) -> int or None:
+        index = self._label_ids.get(label_id)
+        if index is None or index not in self._identity:
+            return None
+        return self._identity.find(index)
+
+    def get_node_by_label_id(self, label_id: str) -> Node or None:
+        root = self._get_root(label_id)
+        return self._get_canonical_node(root) if root is not None else None
+
+    def get_canonical_label_id(self, label_id: str) -> str or None:
+        node = self.get_node_by_label_id(label_id)
+        return node.label_id if node is not None else None
+
+    def update_node(self, node: Node):
+        # Canonical nodes are held in memory, so changes to their names and attributes are already visible
+        pass
+
+    def close(self):
+        # Nothing to release in memory, stores backed by a database commit and close it here
+        pass
+
+    def get_canonical_label_ids(self) -> Dict[str, str]:
+        # Maps the label id of every known id to the label id of its canonical node
+        result = {}
+        for node in self.get_nodes():
+            canonical_label_id = node.label_id
+            for _id in node.ids:
+                result['%s|%s' % (node.label, _id)] = canonical_label_id
+        return result
 
     def get_node_by_id(self, _id: str, label: str) -> Node:
-        label_id = '%s|%s' % (label, _id)
-        return self.nodes[label_id] if label_id in self.nodes else None
+        return self.get_node_by_label_id('%s|%s' % (label, _id))
 
     def get_nodes(self) -> Iterator[Node]:
-        for node in set(self.nodes.values()):
-            yield node
+        for root in list(self._canonical_nodes.keys()):
+            yield self._get_canonical_node(root)
 
     def get_nodes_by_label(self, label: str) -> List[Node]:
-        result = set()
-        for node in self.nodes.values():
-            if label in node.label.split(';'):
-                result.add(node)
-        return list(result)
+        result = []
+        for full_label in self._labels_by_part.get(label, []):
+            result.extend([self._get_canonical_node(root) for root in self._label_roots[full_label]])
+        return result
+
+    def iterate_nodes_by_label(self, label: str) -> Iterator[Node]:
+        # Same as get_nodes_by_label, stores on disk read the nodes lazily instead of building the list
+        return iter(self.get_nodes_by_label(label))
+
+    def get_node_attribute_keys(self, label: str) -> List[str]:
+        keys = set()
+        for node in self.iterate_nodes_by_label(label):
+            keys.update(node.attributes.keys())
+        return sorted(keys)
+
+    def get_node_count(self) -> int:
+        return len(self._canonical_nodes)
+
+    def get_edge_count(self) -> int:
+        return len(self.edges)
 
     def node_labels(self) -> List[str]:
-        return sorted({node.label for node in self.get_nodes()})
+        return sorted([label for label in self._label_roots if self._label_roots[label]])
 
     def edge_labels(self) -> List[str]:
         return sorted(self.edge_lookup.keys())
@@ -63,20 +165,32 @@ class Network:
         if edge.label not in self.edge_lookup:
             self.edge_lookup[edge.label] = {}
         self.edge_lookup[edge.label][edge.id] = edge
-        if edge.source_label_id not in self.edge_source_lookup:
-            self.edge_source_lookup[edge.source_label_id] = {}
-        self.edge_source_lookup[edge.source_label_id][edge.id] = edge
-        if edge.target_label_id not in self.edge_target_lookup:
-            self.edge_target_lookup[edge.target_label_id] = {}
-        self.edge_target_lookup[edge.target_label_id][edge.id] = edge
+        source = self._label_ids.intern(edge.source_label_id)
+        if source not in self.edge_source_lookup:
+            self.edge_source_lookup[source] = {}
+        self.edge_source_lookup[source][edge.id] = edge
+        target = self._label_ids.intern(edge.target_label_id)
+        if target not in self.edge_target_lookup:
+            self.edge_target_lookup[target] = {}
+        self.edge_target_lookup[target][edge.id] = edge
+
+    def get_edges(self) -> Iterator[Edge]:
+        return iter(self.edges.values())
 
     def get_edges_by_label(self, label: str) -> List[Edge]:
         return list(self.edge_lookup[label].values()) if label in self.edge_lookup else []
 
+    def iterate_resolved_edges(self, label: str) -> Iterator[Tuple[Edge, str or None, str or None]]:
+        # Edges of the label together with the label ids of the canonical nodes of their endpoints, None for
+        # endpoints without a node
+        for edge in self.get_edges_by_label(label):
+            yield (edge, self.get_canonical_label_id(edge.source_label_id),
+                   self.get_canonical_label_id(edge.target_label_id))
+
     def get_node_edges_by_label(self, node: Node, label: str) -> List[Edge]:
         result = []
         if label in self.edge_lookup:
-            for _id in node.ids:
+            for _id in self._get_label_id_indices(node):
                 if _id in self.edge_source_lookup:
                     result.extend([e for e in self.edge_source_lookup[_id].values() if e.label == label])
                 if _id in self.edge_target_lookup:
@@ -86,38 +200,102 @@ class Network:
     def get_edges_from_to(self, node_from: Node, node_to: Node, label: str) -> List[Edge]:
         result = []
         if label in self.edge_lookup:
-            for _id in node_from.ids:
+            for _id in self._get_label_id_indices(node_from):
                 if _id in self.edge_source_lookup:
                     result.extend([e for e in self.edge_source_lookup[_id].values()
                                    if e.label == label and e.target_node_id in node_to.ids])
         return result
 
     def delete_node(self, node: Node):
-        edges = []
-        for _id in node.ids:
-            _id = self.get_node_label_id(node, _id)
-            del self.nodes[_id]
+        self.delete_nodes([node])
+
+    def delete_nodes(self, nodes: Iterable[Node]):
+        roots = set()
+        for node in nodes:
+            roots.update([self._identity.find(x) for x in self._get_label_id_indices(node) if x in self._identity])
+        self._delete_roots(roots)
+
+    def _delete_roots(self, roots: Iterable[int]):
+        label_ids = self._detach_roots(roots)
+        edges = {}
+        for _id in label_ids:
             if _id in self.edge_source_lookup:
-                edges.extend(self.edge_source_lookup[_id].values())
-                del self.edge_source_lookup[_id]
+                edges.update(self.edge_source_lookup[_id])
             if _id in self.edge_target_lookup:
-                edges.extend(self.edge_target_lookup[_id].values())
-                del self.edge_target_lookup[_id]
-        for edge in edges:
-            if edge.id in self.edges:
-                del self.edges[edge.id]
-            if edge.id in self.edge_lookup[edge.label]:
-                del self.edge_lookup[edge.label][edge.id]
+                edges.update(self.edge_target_lookup[_id])
+        self.delete_edges(edges.values())
+
+    def detach_nodes(self, label_ids: Iterable[str]) -> Set[str]:
+        # Removes the identity sets of the label ids but keeps all edges, so they resolve again once nodes with the
+        # same ids are added. Returns the label ids of all removed sets.
+        roots = {self._get_root(x) for x in label_ids}
+        roots.discard(None)
+        return {self._label_ids.lookup(x) for x in self._detach_roots(roots)}
+
+    def _detach_roots(self, roots: Iterable[int]) -> Set[int]:
+        label_ids = set()
+        for root in roots:
+            canonical_node = self._canonical_nodes.pop(root)
+            self._label_roots[canonical_node.label].discard(root)
+            # Pending nodes are dropped unmerged, only their ids are needed to clear the identity sets
+            for node in [canonical_node] + self._pending_merges.pop(root, []):
+                label_ids.update(self._get_label_id_indices(node))
+        self._identity.remove(label_ids)
+        self._nodes = None
+        return label_ids
+
+    def build_adjacency_index(self) -> AdjacencyIndex:
+        nodes = []
+        node_indices = {}
+        for root in list(self._canonical_nodes.keys()):
+            node_indices[root] = len(nodes)
+            nodes.append(self._get_canonical_node(root))
+        edge_endpoints = {}
+        for label in self.edge_lookup:
+            sources = array('q')
+            targets = array('q')
+            for edge in self.edge_lookup[label].values():
+                source = self._get_root(edge.source_label_id)
+                target = self._get_root(edge.target_label_id)
+                if source is not None and target is not None:
+                    sources.append(node_indices[source])
+                    targets.append(node_indices[target])
+            edge_endpoints[label] = (sources, targets)
+        return AdjacencyIndex(nodes, edge_endpoints)
 
     @staticmethod
     def get_node_label_id(node: Node, _id: str or None = None) -> str:
         return '%s|%s' % (node.label, _id if _id else node.id)
 
     def delete_edge(self, edge: Edge):
-        del self.edges[edge.id]
-        del self.edge_lookup[edge.label][edge.id]
-        del self.edge_source_lookup[edge.source_label_id][edge.id]
-        del self.edge_target_lookup[edge.target_label_id][edge.id]
+        self.delete_edges([edge])
+
+    def delete_edges(self, edges: Iterable[Edge]):
+        for edge in edges:
+            if self.edges.pop(edge.id, None) is None:
+                continue
+            del self.edge_lookup[edge.label][edge.id]
+            self._delete_from_lookup(self.edge_source_lookup, self._label_ids.get(edge.source_label_id), edge)
+            self._delete_from_lookup(self.edge_target_lookup, self._label_ids.get(edge.target_label_id), edge)
+
+    @staticmethod
+    def _delete_from_lookup(lookup: Dict[int, Dict[int, Edge]], label_id: int, edge: Edge):
+        edges = lookup.get(label_id)
+        if edges is not None:
+            edges.pop(edge.id, None)
+            if not edges:
+                del lookup[label_id]
+
+    def get_node_degrees(self) -> Dict[Node, int]:
+        return {self._get_canonical_node(root): degree for root, degree in self._get_root_degrees().items()}
+
+    def _get_root_degrees(self) -> Dict[int, int]:
+        degrees = {root: 0 for root in self._canonical_nodes}
+        for lookup in [self.edge_source_lookup, self.edge_target_lookup]:
+            for _id, edges in lookup.items():
+                if _id in self._identity:
+                    degrees[self._identity.find(_id)] += len(edges)
+        return degrees
 
     def prune(self):
         '''
@@ -133,44 +311,61 @@ class Network:
                 self.delete_node(variant)
         '''
         # Remove singletons
-        for node in set(self.nodes.values()):
-            label_ids = [self.get_node_label_id(node, _id) for _id in node.ids]
-            if not any([_id in self.edge_source_lookup or _id in self.edge_target_lookup for _id in label_ids]):
-                self.delete_node(node)
+        degrees = self._get_root_degrees()
+        self._delete_roots([root for root in degrees if degrees[root] == 0])
 
-    def merge_duplicate_edges(self):
+    def merge_duplicate_edges(self) -> Dict[str, int]:
+        removed_counts = {}
         for label in self.edge_lookup:
-            edges = list(self.edge_lookup[label].values())
-            edge_source_target_lookup = {}
-            for edge in edges:
-                key = '%s$%s' % (self.get_node_label_id(self.nodes[edge.source_label_id]),
-                                 self.get_node_label_id(self.nodes[edge.target_label_id]))
-                if key not in edge_source_target_lookup:
-                    edge_source_target_lookup[key] = []
-                edge_source_target_lookup[key].append(edge)
-            for source_target_key in edge_source_target_lookup:
-                edges_subset = edge_source_target_lookup[source_target_key]
-                for i in range(0, len(edges_subset) - 1):
-                    edge_a = edges_subset[i]
-                    for j in range(i + 1, len(edges_subset)):
-                        edge_b = edges_subset[j]
-                        identical = len(edge_a.attributes.keys()) == len(edge_b.attributes.keys())
-                        if identical:
-                            for key in edge_a.attributes.keys():
-                                if key not in edge_b.attributes or edge_a.attributes[key] != edge_b.attributes[key]:
-                                    identical = False
-                                    break
-                        if identical:
-                            self.delete_edge(edge_a)
-                            break
+            # Keep the last of all identical edges, same as the former pairwise comparison did
+            last_edges = {}
+            duplicates = []
+            for edge in self.edge_lookup[label].values():
+                key = (self._get_endpoint_key(edge.source_label_id), self._get_endpoint_key(edge.target_label_id),
+                       self.get_attributes_signature(edge.attributes))
+                if key in last_edges:
+                    duplicates.append(last_edges[key])
+                last_edges[key] = edge
+            for edge in duplicates:
+                self.delete_edge(edge)
+            removed_counts[label] = len(duplicates)
+        return removed_counts
+
+    def _get_endpoint_key(self, label_id: str) -> int or str:
+        # Endpoints without a node yet may still be added by another graph later, they are only equal by label id
+        root = self._get_root(label_id)
+        return root if root is not None else label_id
+
+    @staticmethod
+    def get_attributes_signature(attributes: Dict[str, Any]) -> frozenset:
+        return frozenset((key, Network._get_hashable_value(value)) for key, value in attributes.items())
+
+    @staticmethod
+    def _get_hashable_value(value: Any) -> Any:
+        if isinstance(value, (list, tuple)):
+            return tuple(Network._get_hashable_value(x) for x in value)
+        if isinstance(value, set):
+            return frozenset(Network._get_hashable_value(x) for x in value)
+        if isinstance(value, dict):
+            return Network.get_attributes_signature(value)
+        return value
 
     def to_dict(self) -> {}:
-        result = {
-            'node_types': {},
-            'nodes': [],
-            'edges': []
+        return {
+            'node_types': self.get_node_types(),
+            'nodes': list(self.get_node_records()),
+            'edges': list(self.get_edge_records())
         }
-        for node in set(self.nodes.values()):
+
+    def get_node_types(self) -> Dict[str, str]:
+        result = {}
+        for node in self.get_nodes():
+            if node.label not in result:
+                result[node.label] = node.__module__
+        return result
+
+    def get_node_records(self) -> Iterator[Dict[str, Any]]:
+        for node in self.get_nodes():
             n = {
                 'ids': sorted(node.ids),
                 'names': sorted(node.names),
@@ -178,10 +373,10 @@ class Network:
                 '_label': node.label
             }
             n.update(node.attributes)
-            if node.label not in result['node_types']:
-                result['node_types'][node.label] = node.__module__
-            result['nodes'].append(n)
-        for edge in self.edges.values():
+            yield n
+
+    def get_edge_records(self) -> Iterator[Dict[str, Any]]:
+        for edge in self.get_edges():
             e = {
                 '_label': edge.label,
                 '_source_id': edge.source_node_id,
@@ -191,83 +386,141 @@ class Network:
             }
             for key in edge.attributes:
                 e[key] = edge.attributes[key]
-            result['edges'].append(e)
-        return result
+            yield e
 
     def load_from_dict(self, source: {}):
-        py_class_map = {}
-        for label in source['node_types']:
-            if ';' not in label:
-                module_name = source['node_types'][label]
-                module = __import__(module_name)
-                for package in module_name.split('.')[1:]:
-                    module = getattr(module, package)
-                py_class_map[label] = getattr(module, label)
-        for node in source['nodes']:
-            node_instance: Node
-            if ';' not in node['_label']:
-                class_ = py_class_map[node['_label']]
-                node_instance = class_(node['ids'], node['names'])
-            elif 'RNA' in node['_label']:
-                label = node['_label']
-                if 'CircRNA' in label:
-                    node_instance = CircRNA(node['ids'], node['names'])
-                elif 'ERNA' in label:
-                    node_instance = ERNA(node['ids'], node['names'])
-                elif 'LncRNA' in label:
-                    node_instance = LncRNA(node['ids'], node['names'])
-                elif 'MiRNA' in label:
-                    node_instance = MiRNA(node['ids'], node['names'])
-                elif 'MRNA' in label:
-                    node_instance = MRNA(node['ids'], node['names'])
-                elif 'NcRNA' in label:
-                    node_instance = NcRNA(node['ids'], node['names'])
-                elif 'PiRNA' in label:
-                    node_instance = PiRNA(node['ids'], node['names'])
-                elif 'Pseudogene' in label:
-                    node_instance = Pseudogene(node['ids'], node['names'])
-                elif 'Ribozyme' in label:
-                    node_instance = Ribozyme(node['ids'], node['names'])
-                elif 'RRNA' in label:
-                    node_instance = RRNA(node['ids'], node['names'])
-                elif 'ScaRNA' in label:
-                    node_instance = ScaRNA(node['ids'], node['names'])
-                elif 'ScRNA' in label:
-                    node_instance = ScRNA(node['ids'], node['names'])
-                elif 'SnoRNA' in label:
-                    node_instance = SnoRNA(node['ids'], node['names'])
-                elif 'SnRNA' in label:
-                    node_instance = SnRNA(node['ids'], node['names'])
-                else:
-                    node_instance = RNA(node['ids'], node['names'])
-            else:
-                print('[Err ] Failed to load node with multiple labels', node)
-                continue
-            for key in node.keys():
-                if key not in ['_id', 'ids', 'names', '_label']:
-                    node_instance.attributes[key] = node[key]
-            self.add_node(node_instance)
-
+        for node in registry.create_nodes(source['nodes'], source['node_types']):
+            self.add_node(node)
         for edge in source['edges']:
-            params = dict(edge)
-            del params['_source_id']
-            del params['_source_label']
-            del params['_target_id']
-            del params['_target_label']
-            del params['_label']
-            source_node = self.get_node_by_id(edge['_source_id'], edge['_source_label'])
-            if source_node is None:
-                print('Failed to load edge: could not find source node with label %s and id %s' % (
-                    edge['_source_label'], edge['_source_id']))
-            target_node = self.get_node_by_id(edge['_target_id'], edge['_target_label'])
-            if target_node is None:
-                print('Failed to load edge: could not find target node with label %s and id %s' % (
-                    edge['_target_label'], edge['_target_id']))
-            self.add_edge(Edge(source_node, target_node, edge['_label'], params))
-
-    def save(self, file_path: str, indent: bool = False):
+            self._add_edge_record(edge)
+
+    def load(self, file_path: str, processes: int = 1, cache: NetworkCache or None = None):
+        if cache is None:
+            self._load_file(file_path, processes)
+            return
+        network = cache.get(file_path)
+        if network is None:
+            network = Network()
+            network._load_file(file_path, processes)
+            cache.put(file_path, network)
+        else:
+            # Edges created later in this process must not reuse the ids of the cached edges
+            Edge.advance_id_counter(max(network.edges.keys(), default=0))
+        if not self.edges and not self._canonical_nodes:
+            self.__dict__.update(network.__dict__)
+        else:
+            self.merge(network)
+
+    def _load_file(self, file_path: str, processes: int):
+        if file_path.endswith('.jsonl'):
+            self.load_from_jsonl(file_path, processes)
+        else:
+            self.load_from_json(file_path)
+
+    def load_from_json(self, file_path: str):
+        with io.open(file_path, 'r', encoding='utf-8', newline='') as f:
+            node_types = None
+            # Node records are collected into batches for the bulk constructor of the registry
+            node_records = []
+            for key, value in json_stream.iterate_object(f, {'nodes', 'edges'}):
+                if key == 'node_types':
+                    node_types = value
+                elif key == 'nodes':
+                    if node_types is None:
+                        raise ValueError('Failed to load %s: node_types have to precede the nodes' % file_path)
+                    node_records.append(value)
+                    if len(node_records) >= NODE_BATCH_SIZE:
+                        self._add_node_records(node_records, node_types)
+                        node_records = []
+                elif key == 'edges':
+                    # Edges are resolved against all nodes before them
+                    if node_records:
+                        self._add_node_records(node_records, node_types)
+                        node_records = []
+                    self._add_edge_record(value)
+            if node_records:
+                self._add_node_records(node_records, node_types)
+
+    def _add_node_records(self, records: List[Dict[str, Any]], node_types: Dict[str, str]):
+        for node in registry.create_nodes(records, node_types):
+            self.add_node(node)
+
+    def load_from_jsonl(self, file_path: str, processes: int = 1):
+        with io.open(file_path, 'rb') as f:
+            node_types = json.loads(f.readline().decode('utf-8'))['node_types']
+            start = f.tell()
+            end = f.seek(0, io.SEEK_END)
+            # Split the records into byte ranges that start at line boundaries
+            boundaries = [start]
+            for i in range(1, max(processes, 1)):
+                f.seek(max(start + (end - start) * i // processes - 1, boundaries[-1]))
+                f.readline()
+                boundaries.append(max(f.tell(), boundaries[-1]))
+            boundaries.append(end)
+        chunks = [(file_path, boundaries[i], boundaries[i + 1], node_types) for i in range(0, len(boundaries) - 1)]
+        if len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+                results = list(executor.map(_load_jsonl_chunk, *zip(*chunks)))
+        else:
+            results = [_load_jsonl_chunk(*chunks[0])]
+        # Nodes of all chunks have to be added before any edge can be resolved
+        for nodes, _ in results:
+            for node in nodes:
+                self.add_node(node)
+        for _, edges in results:
+            for edge in edges:
+                self._add_edge_record(edge)
+
+    def _add_edge_record(self, edge: Dict[str, Any]):
+        params = dict(edge)
+        del params['_source_id']
+        del params['_source_label']
+        del params['_target_id']
+        del params['_target_label']
+        del params['_label']
+        source_node = self.get_node_by_id(edge['_source_id'], edge['_source_label'])
+        if source_node is None:
+            print('Failed to load edge: could not find source node with label %s and id %s' % (
+                edge['_source_label'], edge['_source_id']))
+        target_node = self.get_node_by_id(edge['_target_id'], edge['_target_label'])
+        if target_node is None:
+            print('Failed to load edge: could not find target node with label %s and id %s' % (
+                edge['_target_label'], edge['_target_id']))
+        self.add_edge(Edge(source_node, target_node, edge['_label'], params))
+
+    def save(self, file_path: str, indent: bool = False, compact: bool = False):
+        if file_path.endswith('.jsonl'):
+            self.save_jsonl(file_path)
+            return
+        with io.open(file_path, 'w', encoding='utf-8', newline='') as f:
+            self.write_json(f, indent, compact)
+
+    def save_jsonl(self, file_path: str):
         with io.open(file_path, 'w', encoding='utf-8', newline='') as f:
-            if indent:
-                f.write(json.dumps(self.to_dict(), indent=2))
+            f.write(json.dumps({'node_types': self.get_node_types()}, separators=(',', ':')) + '\n')
+            for record in itertools.chain(self.get_node_records(), self.get_edge_records()):
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def write_json(self, f: TextIO, indent: bool = False, compact: bool = False):
+        json_stream.write_object(f, [
+            ('node_types', self.get_node_types()),
+            ('nodes', self.get_node_records()),
+            ('edges', self.get_edge_records())
+        ], indent=2 if indent else None, separators=(',', ':') if compact else None)
+
+
+def _load_jsonl_chunk(file_path: str, start: int, end: int, node_types: Dict[str, str]) -> (List[Node],
+                                                                                             List[Dict[str, Any]]):
+    node_records = []
+    edges = []
+    with io.open(file_path, 'rb') as f:
+        f.seek(start)
+        for line in f.read(end - start).decode('utf-8').split('\n'):
+            if not line:
+                continue
+            record = json.loads(line)
+            if '_source_id' in record:
+                edges.append(record)
             else:
-                f.write(json.dumps(self.to_dict()))
+                node_records.append(record)
+    return registry.create_nodes(node_records, node_types), edges
@@ -0,0 +1,95 @@
+import io
+import os
+import json
+import pickle
+import hashlib
+from typing import Dict, Any
+
+from utils import hash_utils
+
+# Increase whenever the pickled model classes change in an incompatible way
+CACHE_VERSION = 1
+
+
+class NetworkCache:
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+
+    @staticmethod
+    def from_config(config: Dict[str, Any]) -> 'NetworkCache' or None:
+        if 'network-cache-path' not in config or not config['network-cache-path']:
+            return None
+        return NetworkCache(config['network-cache-path'], config['network-cache-size'])
+
+    def get(self, file_path: str) -> 'Network' or None:
+        # Fusion workers share the cache, so an entry may be evicted by another process at any point. A missing entry
+        # is a cache miss and the network is loaded from its source instead.
+        cache_file_path = self._get_cache_file_path(file_path)
+        try:
+            with io.open(cache_file_path, 'rb') as f:
+                network = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print('[WARN] Failed to read cached network %s: %s' % (cache_file_path, e))
+            return None
+        try:
+            # Mark the entry as recently used for the eviction
+            os.utime(cache_file_path)
+        except OSError:
+            pass
+        return network
+
+    def put(self, file_path: str, network: 'Network'):
+        os.makedirs(self.directory, exist_ok=True)
+        cache_file_path = self._get_cache_file_path(file_path)
+        temp_file_path = '%s.%s.tmp' % (cache_file_path, os.getpid())
+        with io.open(temp_file_path, 'wb') as f:
+            pickle.dump(network, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file_path, cache_file_path)
+        self.evict()
+
+    def evict(self):
+        # Other processes may evict the same entries concurrently, entries already gone are skipped
+        entries = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.pickle'):
+                try:
+                    stat = os.stat(os.path.join(self.directory, file_name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, file_name))
+        total_size = sum([x[1] for x in entries])
+        # Keep at least the most recent entry, even if it exceeds the size limit on its own
+        for _, size, file_name in sorted(entries)[:-1]:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.directory, file_name))
+            except OSError:
+                pass
+            total_size -= size
+
+    def _get_cache_file_path(self, file_path: str) -> str:
+        return os.path.join(self.directory, '%s-v%s.pickle' % (self.get_fingerprint(file_path)['hash'], CACHE_VERSION))
+
+    def get_fingerprint(self, file_path: str) -> Dict[str, Any]:
+        stat = os.stat(file_path)
+        fingerprint = {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+        # The content hash is only recalculated if size or modification time changed since the last lookup
+        path_hash = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        fingerprint_file_path = os.path.join(self.directory, '%s.fingerprint' % path_hash)
+        if os.path.exists(fingerprint_file_path):
+            with io.open(fingerprint_file_path, 'r', encoding='utf-8', newline='') as f:
+                known_fingerprint = json.load(f)
+            if known_fingerprint['size'] == fingerprint['size'] and known_fingerprint['mtime'] == fingerprint['mtime']:
+                return known_fingerprint
+        fingerprint['hash'] = hash_utils.get_file_hash(file_path)
+        os.makedirs(self.directory, exist_ok=True)
+        temp_file_path = '%s.%s.tmp' % (fingerprint_file_path, os.getpid())
+        with io.open(temp_file_path, 'w', encoding='utf-8', newline='') as f:
+            json.dump(fingerprint, f)
+        os.replace(temp_file_path, fingerprint_file_path)
+        return fingerprint
+
@@ -2,13 +2,32 @@ from typing import Set, Any, Dict
 
 
 class Node:
+    __slots__ = ('ids', 'names', 'hash', 'attributes', '_primary_id_prefix', '_id', '_label_id')
+    _labels: Dict[type, str] = {}
+
     def __init__(self, ids: [str], names: [str]):
         self.ids: Set[str] = set(ids)
         self.names: Set[str] = set(names)
         self.hash = self.calculate_hash()
         self.attributes: Dict[str, Any] = {}
+        self._id: str or None = None
+        self._label_id: str or None = None
         self.primary_id_prefix = ''
 
+    @classmethod
+    def create(cls, ids: [str], names: [str], primary_id_prefix: str) -> 'Node':
+        # Same as the constructor of a subclass which only sets its primary id prefix, without running the constructor
+        # chain and the prefix setter. Used by the registry to create many nodes of classes declaring a bulk_prefix.
+        node = cls.__new__(cls)
+        node.ids = set(ids)
+        node.names = set(names)
+        node.hash = node.calculate_hash()
+        node.attributes = {}
+        node._primary_id_prefix = primary_id_prefix
+        node._id = None
+        node._label_id = None
+        return node
+
     def __str__(self) -> str:
         sorted_ids_text = ','.join(sorted(self.ids))
         sorted_names_text = ','.join(['"%s"' % x for x in sorted(self.names)])
@@ -24,22 +43,49 @@ class Node:
 
     @property
     def label(self) -> str:
-        label = self.__class__.__name__
-        for base in self.__class__.__bases__:
-            if base.__name__ != 'Node':
-                label += ';' + base.__name__
+        return Node.get_class_label(self.__class__)
+
+    @staticmethod
+    def get_class_label(class_: type) -> str:
+        label = Node._labels.get(class_)
+        if label is None:
+            label = class_.__name__
+            for base in class_.__bases__:
+                if base.__name__ != 'Node':
+                    label += ';' + base.__name__
+            Node._labels[class_] = label
         return label
 
+    @property
+    def primary_id_prefix(self) -> str:
+        return self._primary_id_prefix
+
+    @primary_id_prefix.setter
+    def primary_id_prefix(self, value: str):
+        self._primary_id_prefix = value
+        self.invalidate_cache()
+
     @property
     def id(self) -> str:
-        for x in self.ids:
-            if x.startswith('%s:' % self.primary_id_prefix):
-                return x
-        return list(self.ids)[0]
+        if self._id is None:
+            prefix = '%s:' % self._primary_id_prefix
+            for x in self.ids:
+                if x.startswith(prefix):
+                    self._id = x
+                    break
+            else:
+                self._id = list(self.ids)[0]
+        return self._id
 
     @property
     def label_id(self) -> str:
-        return '%s|%s' % (self.label, self.id)
+        if self._label_id is None:
+            self._label_id = '%s|%s' % (self.label, self.id)
+        return self._label_id
+
+    def invalidate_cache(self):
+        self._id = None
+        self._label_id = None
 
     def get_first_id_with_prefix(self, prefix: str) -> str or None:
         for x in self.ids:
@@ -48,14 +94,20 @@ class Node:
         return None
 
     def merge(self, o):
-        self.ids.update(o.ids)
-        self.names.update(o.names)
-        for key in o.attributes:
-            if key in self.attributes and self.attributes[key] != o.attributes[key]:
-                print('[WARN] merging nodes where both have the same attribute key "%s" and the values differ.' % key)
-                print('\t', self.attributes[key])
-                print('\t', o.attributes[key])
+        self.merge_many([o])
+
+    def merge_many(self, others: ['Node']):
+        for o in others:
+            self.ids.update(o.ids)
+            self.names.update(o.names)
+            for key in o.attributes:
+                if key in self.attributes and self.attributes[key] != o.attributes[key]:
+                    print('[WARN] merging nodes where both have the same attribute key "%s" and the values differ.'
+                          % key)
+                    print('\t', self.attributes[key])
+                    print('\t', o.attributes[key])
         self.hash = self.calculate_hash()
+        self.invalidate_cache()
 
     def calculate_hash(self):
         return ','.join(self.ids).__hash__()
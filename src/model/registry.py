@@ -0,0 +1,85 @@
+import importlib
+from typing import Dict, List, Iterable, Tuple, Any
+
+from model.node import Node
+from model.adr import AdverseDrugReaction
+from model.circrna import CircRNA
+from model.disease import Disease
+from model.drug import Drug
+from model.erna import ERNA
+from model.gene import Gene
+from model.go_class import GOClass
+from model.lncrna import LncRNA
+from model.mirna import MiRNA
+from model.mrna import MRNA
+from model.ncrna import NcRNA
+from model.pirna import PiRNA
+from model.pseudogene import Pseudogene
+from model.ribozyme import Ribozyme
+from model.rna import RNA
+from model.rrna import RRNA
+from model.scarna import ScaRNA
+from model.scrna import ScRNA
+from model.snorna import SnoRNA
+from model.snrna import SnRNA
+from model.variant import Variant
+
+_node_classes: Dict[str, type] = {}
+_record_keys = {'_id', 'ids', 'names', '_label'}
+
+
+def register_node_class(class_: type) -> type:
+    _node_classes[Node.get_class_label(class_)] = class_
+    return class_
+
+
+def get_node_class(label: str, module_name: str or None = None) -> type or None:
+    class_ = _node_classes.get(label)
+    if class_ is None and module_name is not None:
+        # Unknown classes are imported from the module recorded in the node types. Multi labels start with the name
+        # of the class itself, followed by its base classes.
+        class_ = getattr(importlib.import_module(module_name), label.split(';')[0], None)
+        if class_ is not None:
+            register_node_class(class_)
+    return class_
+
+
+def get_bulk_prefix(class_: type) -> str or None:
+    # Classes opt in to the bulk creation by declaring the bulk_prefix their constructor sets. Only the class itself
+    # counts, a subclass inheriting the marker may set up more in its own constructor.
+    return vars(class_).get('bulk_prefix')
+
+
+def create_node(record: Dict[str, Any], node_types: Dict[str, str]) -> Node or None:
+    nodes = create_nodes([record], node_types)
+    return nodes[0] if nodes else None
+
+
+def create_nodes(records: Iterable[Dict[str, Any]], node_types: Dict[str, str]) -> List[Node]:
+    # Class and primary id prefix are resolved once per label for the whole batch. Nodes of classes declaring a bulk
+    # prefix are then created without running the constructor chain of their class.
+    resolved: Dict[str, Tuple[type or None, str or None]] = {}
+    result = []
+    for record in records:
+        label = record['_label']
+        if label not in resolved:
+            class_ = get_node_class(label, node_types.get(label))
+            resolved[label] = (class_, get_bulk_prefix(class_) if class_ is not None else None)
+        class_, prefix = resolved[label]
+        if class_ is None:
+            print('[Err ] Failed to load node with unknown label', record)
+            continue
+        if prefix is None:
+            node = class_(record['ids'], record['names'])
+        else:
+            node = class_.create(record['ids'], record['names'], prefix)
+        for key in record:
+            if key not in _record_keys:
+                node.attributes[key] = record[key]
+        result.append(node)
+    return result
+
+
+for _class in [AdverseDrugReaction, CircRNA, Disease, Drug, ERNA, Gene, GOClass, LncRNA, MiRNA, MRNA, NcRNA, PiRNA,
+               Pseudogene, Ribozyme, RNA, RRNA, ScaRNA, ScRNA, SnoRNA, SnRNA, Variant]:
+    register_node_class(_class)
@@ -2,6 +2,9 @@ from model.node import Node
 
 
 class RNA(Node):
+    __slots__ = ()
+    bulk_prefix = ''
+
     def __init__(self, ids: [str], names: [str]):
         super().__init__(ids, names)
         self.primary_id_prefix = ''
\ No newline at end of file
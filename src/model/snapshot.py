@@ -0,0 +1,283 @@
+import io
+import json
+import mmap
+import itertools
+import struct
+from array import array
+from typing import List, Dict, Iterator, Tuple, Any
+
+from model.node import Node
+from model.edge import Edge
+from model.network import Network
+from model import registry
+from utils.intern_table import InternTable
+
+MAGIC = b'GCNSNAP1'
+# Magic followed by the section counts and offsets
+HEADER = struct.Struct('<8s14Q')
+# Label string, module string, first and last + 1 record index
+LABEL = struct.Struct('<IIQQ')
+# Label index, id string, refs start, ids count, names count, attributes count, edge refs start, out count, in count
+NODE = struct.Struct('<IIQIIIQII')
+# Label index, source node, target node, source id, source label, target id, target label, refs start,
+# attributes count
+EDGE = struct.Struct('<IIIIIIIQI')
+# Label id string, node index
+KEY = struct.Struct('<II')
+UNRESOLVED = 0xFFFFFFFF
+
+
+def write_snapshot(network: Network, file_path: str):
+    strings = InternTable()
+    refs = array('I')
+    # Nodes are grouped by label, the stable sort keeps the network order within a label. Edges are read label by
+    # label in network order.
+    nodes = sorted(network.get_nodes(), key=lambda x: x.label)
+    # Endpoints are resolved by label id, as stores like SqliteNetwork return new node objects on every lookup
+    node_indices = {node.label_id: i for i, node in enumerate(nodes)}
+    edges = itertools.chain.from_iterable(network.iterate_resolved_edges(x) for x in network.edge_labels())
+    out_edges = [[] for _ in nodes]
+    in_edges = [[] for _ in nodes]
+    edge_records = bytearray()
+    edge_labels = []
+    edge_count = 0
+    for i, (edge, source_label_id, target_label_id) in enumerate(edges):
+        if not edge_labels or edge_labels[-1][0] != edge.label:
+            edge_labels.append([edge.label, i, i])
+        edge_labels[-1][2] = i + 1
+        edge_count = i + 1
+        source = node_indices[source_label_id] if source_label_id is not None else UNRESOLVED
+        target = node_indices[target_label_id] if target_label_id is not None else UNRESOLVED
+        if source != UNRESOLVED:
+            out_edges[source].append(i)
+        if target != UNRESOLVED:
+            in_edges[target].append(i)
+        refs_start = len(refs)
+        _append_attributes(refs, strings, edge.attributes)
+        edge_records += EDGE.pack(len(edge_labels) - 1, source, target, strings.intern(edge.source_node_id),
+                                  strings.intern(edge.source_node_label), strings.intern(edge.target_node_id),
+                                  strings.intern(edge.target_node_label), refs_start, len(edge.attributes))
+    node_records = bytearray()
+    node_labels = []
+    edge_refs = array('I')
+    keys = []
+    for i, node in enumerate(nodes):
+        label = node.label
+        if not node_labels or node_labels[-1][0] != label:
+            node_labels.append([label, node.__module__, i, i])
+        node_labels[-1][3] = i + 1
+        refs_start = len(refs)
+        refs.extend([strings.intern(x) for x in sorted(node.ids)])
+        refs.extend([strings.intern(x) for x in sorted(node.names)])
+        _append_attributes(refs, strings, node.attributes)
+        edge_refs_start = len(edge_refs)
+        edge_refs.extend(out_edges[i])
+        edge_refs.extend(in_edges[i])
+        node_records += NODE.pack(len(node_labels) - 1, strings.intern(node.id), refs_start, len(node.ids),
+                                  len(node.names), len(node.attributes), edge_refs_start, len(out_edges[i]),
+                                  len(in_edges[i]))
+        keys.extend([(('%s|%s' % (label, x)).encode('utf-8'), i) for x in node.ids])
+    keys.sort()
+    key_records = bytearray()
+    for key, i in keys:
+        key_records += KEY.pack(strings.intern(key.decode('utf-8')), i)
+    label_records = bytearray()
+    for label, module, start, end in node_labels:
+        label_records += LABEL.pack(strings.intern(label), strings.intern(module), start, end)
+    for label, start, end in edge_labels:
+        label_records += LABEL.pack(strings.intern(label), 0, start, end)
+    string_offsets = array('Q', [0])
+    string_blob = bytearray()
+    for value in strings.values:
+        string_blob += value.encode('utf-8')
+        string_offsets.append(len(string_blob))
+    sections = [label_records, node_records, edge_records, refs.tobytes(), edge_refs.tobytes(), key_records,
+                string_offsets.tobytes(), string_blob]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+    with io.open(file_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(node_labels), len(edge_labels), len(nodes), edge_count, len(keys),
+                            len(strings), *offsets))
+        for section in sections:
+            f.write(section)
+
+
+def _append_attributes(refs: array, strings: InternTable, attributes: Dict[str, Any]):
+    for key in attributes:
+        refs.append(strings.intern(key))
+        refs.append(strings.intern(json.dumps(attributes[key])))
+
+
+class Snapshot:
+    def __init__(self, file_path: str):
+        self._file = io.open(file_path, 'rb')
+        # Read only mappings share their pages between all processes opening the same snapshot
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = HEADER.unpack_from(self._buffer, 0)
+        if header[0] != MAGIC:
+            raise ValueError('%s is not a network snapshot' % file_path)
+        (self._node_label_count, self._edge_label_count, self.node_count, self.edge_count, self._key_count,
+         self._string_count) = header[1:7]
+        (self._labels_offset, self._nodes_offset, self._edges_offset, self._refs_offset, self._edge_refs_offset,
+         self._keys_offset, self._string_offsets_offset, self._strings_offset) = header[7:]
+        self._node_labels: List[Tuple[str, str, int, int]] = []
+        for i in range(0, self._node_label_count):
+            label, module, start, end = LABEL.unpack_from(self._buffer, self._labels_offset + i * LABEL.size)
+            self._node_labels.append((self._get_string(label), self._get_string(module), start, end))
+        self._edge_labels: List[Tuple[str, int, int]] = []
+        for i in range(self._node_label_count, self._node_label_count + self._edge_label_count):
+            label, _, start, end = LABEL.unpack_from(self._buffer, self._labels_offset + i * LABEL.size)
+            self._edge_labels.append((self._get_string(label), start, end))
+        self._node_classes: Dict[int, type] = {}
+        self._nodes: Dict[int, Node] = {}
+        self._node_indices: Dict[int, int] = {}
+        self._edges: Dict[int, Edge] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._buffer.close()
+        self._file.close()
+
+    def _get_string_bytes(self, index: int) -> bytes:
+        start, end = struct.unpack_from('<2Q', self._buffer, self._string_offsets_offset + index * 8)
+        return self._buffer[self._strings_offset + start:self._strings_offset + end]
+
+    def _get_string(self, index: int) -> str:
+        return self._get_string_bytes(index).decode('utf-8')
+
+    def _get_strings(self, start: int, count: int) -> List[str]:
+        indices = struct.unpack_from('<%sI' % count, self._buffer, self._refs_offset + start * 4)
+        return [self._get_string(x) for x in indices]
+
+    def _get_attributes(self, start: int, count: int) -> Dict[str, Any]:
+        values = self._get_strings(start, count * 2)
+        return {values[i]: json.loads(values[i + 1]) for i in range(0, len(values), 2)}
+
+    def _get_node_class(self, label_index: int) -> type:
+        if label_index not in self._node_classes:
+            label, module_name, _, _ = self._node_labels[label_index]
+            self._node_classes[label_index] = registry.get_node_class(label, module_name)
+        return self._node_classes[label_index]
+
+    def get_node(self, index: int) -> Node:
+        if index not in self._nodes:
+            (label_index, _, refs_start, ids_count, names_count, attributes_count, _, _,
+             _) = NODE.unpack_from(self._buffer, self._nodes_offset + index * NODE.size)
+            node = self._get_node_class(label_index)(self._get_strings(refs_start, ids_count),
+                                                     self._get_strings(refs_start + ids_count, names_count))
+            node.attributes.update(self._get_attributes(refs_start + ids_count + names_count, attributes_count))
+            self._nodes[index] = node
+            self._node_indices[id(node)] = index
+        return self._nodes[index]
+
+    def get_edge(self, index: int) -> Edge:
+        if index not in self._edges:
+            (label_index, _, _, source_id, source_label, target_id, target_label, refs_start,
+             attributes_count) = EDGE.unpack_from(self._buffer, self._edges_offset + index * EDGE.size)
+            self._edges[index] = Edge((self._get_string(source_id), self._get_string(source_label)),
+                                      (self._get_string(target_id), self._get_string(target_label)),
+                                      self._edge_labels[label_index][0],
+                                      self._get_attributes(refs_start, attributes_count))
+        return self._edges[index]
+
+    def node_labels(self) -> List[str]:
+        return sorted([label for label, _, _, _ in self._node_labels])
+
+    def edge_labels(self) -> List[str]:
+        return sorted([label for label, _, _ in self._edge_labels])
+
+    def get_nodes(self) -> Iterator[Node]:
+        for i in range(0, self.node_count):
+            yield self.get_node(i)
+
+    def get_nodes_by_label(self, label: str) -> List[Node]:
+        result = []
+        for full_label, _, start, end in self._node_labels:
+            if label in full_label.split(';'):
+                result.extend([self.get_node(i) for i in range(start, end)])
+        return result
+
+    def get_node_by_label_id(self, label_id: str) -> Node or None:
+        key = label_id.encode('utf-8')
+        low = 0
+        high = self._key_count
+        while low < high:
+            middle = (low + high) // 2
+            string_index, node_index = KEY.unpack_from(self._buffer, self._keys_offset + middle * KEY.size)
+            middle_key = self._get_string_bytes(string_index)
+            if middle_key == key:
+                return self.get_node(node_index)
+            if middle_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def get_node_by_id(self, _id: str, label: str) -> Node or None:
+        return self.get_node_by_label_id('%s|%s' % (label, _id))
+
+    def get_edges(self) -> Iterator[Edge]:
+        for i in range(0, self.edge_count):
+            yield self.get_edge(i)
+
+    def get_edges_by_label(self, label: str) -> List[Edge]:
+        for edge_label, start, end in self._edge_labels:
+            if edge_label == label:
+                return [self.get_edge(i) for i in range(start, end)]
+        return []
+
+    def _get_edge_indices(self, node: Node, outgoing: bool, incoming: bool) -> List[int]:
+        index = self._node_indices.get(id(node))
+        if index is None:
+            # Nodes not created by this snapshot are resolved by any of their ids
+            for _id in node.ids:
+                match = self.get_node_by_id(_id, node.label)
+                if match is not None:
+                    index = self._node_indices[id(match)]
+                    break
+        if index is None:
+            return []
+        _, _, _, _, _, _, edge_refs_start, out_count, in_count = NODE.unpack_from(
+            self._buffer, self._nodes_offset + index * NODE.size)
+        start = edge_refs_start if outgoing else edge_refs_start + out_count
+        count = (out_count if outgoing else 0) + (in_count if incoming else 0)
+        return list(struct.unpack_from('<%sI' % count, self._buffer, self._edge_refs_offset + start * 4))
+
+    def _get_edge_label_index(self, label: str) -> int or None:
+        for i, (edge_label, _, _) in enumerate(self._edge_labels):
+            if edge_label == label:
+                return i
+        return None
+
+    def get_node_edges_by_label(self, node: Node, label: str) -> List[Edge]:
+        label_index = self._get_edge_label_index(label)
+        if label_index is None:
+            return []
+        _, start, end = self._edge_labels[label_index]
+        return [self.get_edge(i) for i in self._get_edge_indices(node, True, True) if start <= i < end]
+
+    def get_edges_from_to(self, node_from: Node, node_to: Node, label: str) -> List[Edge]:
+        label_index = self._get_edge_label_index(label)
+        target_indices = self._get_edge_indices(node_to, False, True)
+        if label_index is None or not target_indices:
+            return []
+        _, start, end = self._edge_labels[label_index]
+        target_indices = set(target_indices)
+        return [self.get_edge(i) for i in self._get_edge_indices(node_from, True, False)
+                if start <= i < end and i in target_indices]
+
+    def to_network(self) -> Network:
+        network = Network()
+        for node in self.get_nodes():
+            network.add_node(node)
+        for edge in self.get_edges():
+            network.add_edge(edge)
+        return network
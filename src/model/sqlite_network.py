@@ -0,0 +1,418 @@
+import json
+import sqlite3
+from array import array
+from collections.abc import Mapping
+from typing import List, Dict, Iterator, Iterable, Set, Tuple, Any
+
+from model.adjacency import AdjacencyIndex
+from model.node import Node
+from model.edge import Edge
+from model.network import Network
+from model.network_cache import NetworkCache
+from model import registry
+
+SCHEMA = '''
+CREATE TABLE nodes (id INTEGER PRIMARY KEY, label TEXT NOT NULL, module TEXT NOT NULL, ids TEXT NOT NULL,
+                    names TEXT NOT NULL, attributes TEXT NOT NULL, label_id TEXT NOT NULL);
+CREATE INDEX nodes_label ON nodes (label);
+CREATE TABLE node_ids (label_id TEXT PRIMARY KEY, node INTEGER NOT NULL) WITHOUT ROWID;
+CREATE INDEX node_ids_node ON node_ids (node);
+CREATE TABLE label_parts (label TEXT NOT NULL, part TEXT NOT NULL, PRIMARY KEY (part, label)) WITHOUT ROWID;
+CREATE TABLE edges (id INTEGER PRIMARY KEY, label TEXT NOT NULL, source TEXT NOT NULL, target TEXT NOT NULL,
+                    source_id TEXT NOT NULL, source_label TEXT NOT NULL, target_id TEXT NOT NULL,
+                    target_label TEXT NOT NULL, attributes TEXT NOT NULL, signature TEXT NOT NULL);
+CREATE INDEX edges_label ON edges (label);
+CREATE INDEX edges_source ON edges (source);
+CREATE INDEX edges_target ON edges (target);
+'''
+NODE_COLUMNS = 'n.id, n.label, n.module, n.ids, n.names, n.attributes, n.label_id'
+EDGE_COLUMNS = 'e.id, e.label, e.source_id, e.source_label, e.target_id, e.target_label, e.attributes'
+# Edges with both endpoints resolved to the node row of their canonical set
+RESOLVED_EDGES = '''
+SELECT e.id, e.label, s.node AS source, t.node AS target, e.signature FROM edges e
+LEFT JOIN node_ids s ON s.label_id = e.source LEFT JOIN node_ids t ON t.label_id = e.target
+'''
+# Same, but unresolved endpoints are kept by label id, as they may still be added by another graph later
+ENDPOINT_EDGES = '''
+SELECT e.id, e.label, COALESCE(s.node, e.source) AS source, COALESCE(t.node, e.target) AS target, e.signature
+FROM edges e LEFT JOIN node_ids s ON s.label_id = e.source LEFT JOIN node_ids t ON t.label_id = e.target
+'''
+# Edges with the label ids of the canonical nodes of both endpoints, NULL for endpoints without a node
+CANONICAL_EDGES = '''
+SELECT %s, s.label_id, t.label_id FROM edges e
+LEFT JOIN node_ids si ON si.label_id = e.source LEFT JOIN nodes s ON s.id = si.node
+LEFT JOIN node_ids ti ON ti.label_id = e.target LEFT JOIN nodes t ON t.id = ti.node
+''' % EDGE_COLUMNS
+# Number of edges of the node n, counted over all ids of its set
+NODE_DEGREE = '''
+(SELECT COUNT(*) FROM node_ids i JOIN edges e ON e.source = i.label_id WHERE i.node = n.id) +
+(SELECT COUNT(*) FROM node_ids i JOIN edges e ON e.target = i.label_id WHERE i.node = n.id)
+'''
+
+
+class NodeView(Mapping):
+    # Read only counterpart of Network.nodes, the label id of every id mapped to its canonical node
+    def __init__(self, network: 'SqliteNetwork'):
+        self.network = network
+
+    def __getitem__(self, label_id: str) -> Node:
+        node = self.network.get_node_by_label_id(label_id)
+        if node is None:
+            raise KeyError(label_id)
+        return node
+
+    def __contains__(self, label_id: object) -> bool:
+        return self.network.connection.execute('SELECT 1 FROM node_ids WHERE label_id = ?',
+                                               (label_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.network.connection.execute('SELECT COUNT(*) FROM node_ids').fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        for row in self.network._iterate_rows(
+                'SELECT label_id FROM node_ids WHERE label_id > ? ORDER BY label_id LIMIT ?', last_id=''):
+            yield row[0]
+
+
+class EdgeView(Mapping):
+    # Read only counterpart of Network.edges, every edge by its id
+    def __init__(self, network: 'SqliteNetwork'):
+        self.network = network
+
+    def __getitem__(self, edge_id: int) -> Edge:
+        row = self.network.connection.execute('SELECT %s FROM edges e WHERE e.id = ?' % EDGE_COLUMNS,
+                                              (edge_id,)).fetchone()
+        if row is None:
+            raise KeyError(edge_id)
+        return self.network._to_edge(row)
+
+    def __contains__(self, edge_id: object) -> bool:
+        return self.network.connection.execute('SELECT 1 FROM edges WHERE id = ?', (edge_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.network.get_edge_count()
+
+    def __iter__(self) -> Iterator[int]:
+        for row in self.network._iterate_rows('SELECT id FROM edges WHERE id > ? ORDER BY id LIMIT ?'):
+            yield row[0]
+
+
+class SqliteNetwork(Network):
+    def __init__(self, file_path: str):
+        # The export reads the store from several threads. Rows are only read in pages, so no cursor is shared
+        # between threads and SQLite serializes the calls on the connection.
+        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        # The store is rebuilt on every run, durability is traded for import speed
+        self.connection.execute('PRAGMA journal_mode = OFF')
+        self.connection.execute('PRAGMA synchronous = OFF')
+        self.connection.execute('PRAGMA temp_store = FILE')
+        super().__init__()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def clear(self):
+        for table in ['nodes', 'node_ids', 'label_parts', 'edges']:
+            self.connection.execute('DROP TABLE IF EXISTS %s' % table)
+        self.connection.executescript(SCHEMA)
+
+    @property
+    def nodes(self) -> NodeView:
+        # Views read single rows on access, so the network is never loaded into memory at once
+        return NodeView(self)
+
+    @property
+    def edges(self) -> EdgeView:
+        return EdgeView(self)
+
+    def add_node(self, node: Node):
+        label = node.label
+        label_ids = ['%s|%s' % (label, _id) for _id in node.ids]
+        if not label_ids:
+            return
+        matched_rows = self.connection.execute(
+            'SELECT %s FROM nodes n WHERE n.id IN (SELECT DISTINCT node FROM node_ids WHERE label_id IN (%s)) '
+            'ORDER BY n.id' % (NODE_COLUMNS, self._get_placeholders(label_ids)), label_ids).fetchall()
+        # Same as in memory, the added node stays canonical and keeps its attributes
+        if matched_rows:
+            node.merge_many([self._to_node(row) for row in matched_rows])
+        cursor = self.connection.execute(
+            'INSERT INTO nodes (label, module, ids, names, attributes, label_id) VALUES (?, ?, ?, ?, ?, ?)',
+            (label, node.__module__, json.dumps(sorted(node.ids)), json.dumps(sorted(node.names)),
+             json.dumps(node.attributes), node.label_id))
+        row_id = cursor.lastrowid
+        if matched_rows:
+            matched_ids = [row[0] for row in matched_rows]
+            self.connection.execute('UPDATE node_ids SET node = ? WHERE node IN (%s)' % (
+                self._get_placeholders(matched_ids)), [row_id] + matched_ids)
+            self.connection.execute('DELETE FROM nodes WHERE id IN (%s)' % self._get_placeholders(matched_ids),
+                                    matched_ids)
+        self.connection.executemany('INSERT OR REPLACE INTO node_ids (label_id, node) VALUES (?, ?)',
+                                    [(x, row_id) for x in label_ids])
+        self.connection.executemany('INSERT OR IGNORE INTO label_parts (label, part) VALUES (?, ?)',
+                                    [(label, x) for x in label.split(';')])
+
+    def update_node(self, node: Node):
+        self.connection.execute(
+            'UPDATE nodes SET ids = ?, names = ?, attributes = ? '
+            'WHERE id = (SELECT node FROM node_ids WHERE label_id = ?)',
+            (json.dumps(sorted(node.ids)), json.dumps(sorted(node.names)), json.dumps(node.attributes), node.label_id))
+
+    @staticmethod
+    def _get_placeholders(values: List[Any]) -> str:
+        return ', '.join(['?'] * len(values))
+
+    @staticmethod
+    def _to_node(row: Tuple) -> Node:
+        _, label, module, ids, names, attributes, label_id = row
+        node = registry.get_node_class(label, module)(json.loads(ids), json.loads(names))
+        node.attributes = json.loads(attributes)
+        # The id chosen when the node was stored is kept, ids without the primary prefix are picked in set order
+        node._label_id = label_id
+        node._id = label_id.split('|', 1)[1]
+        return node
+
+    @staticmethod
+    def _to_edge(row: Tuple) -> Edge:
+        row_id, label, source_id, source_label, target_id, target_label, attributes = row
+        edge = Edge((source_id, source_label), (target_id, target_label), label, json.loads(attributes))
+        # Edges keep the id they were added with, so they can be deleted again
+        edge._id = row_id
+        return edge
+
+    def get_node_by_label_id(self, label_id: str) -> Node or None:
+        row = self.connection.execute('SELECT %s FROM node_ids i JOIN nodes n ON n.id = i.node WHERE i.label_id = ?'
+                                      % NODE_COLUMNS, (label_id,)).fetchone()
+        return self._to_node(row) if row is not None else None
+
+    # The roots of the identity sets in memory are the node rows of the store
+    def _get_root(self, label_id: str) -> int or None:
+        row = self.connection.execute('SELECT node FROM node_ids WHERE label_id = ?', (label_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _get_canonical_node(self, root: int) -> Node:
+        return self._to_node(self.connection.execute('SELECT %s FROM nodes n WHERE n.id = ?' % NODE_COLUMNS,
+                                                     (root,)).fetchone())
+
+    def _get_label_id_indices(self, node: Node) -> List[str]:
+        label_ids = self._get_node_label_ids(node)
+        return [x[0] for x in self.connection.execute('SELECT label_id FROM node_ids WHERE label_id IN (%s)'
+                                                      % self._get_placeholders(label_ids), label_ids)]
+
+    def get_canonical_label_id(self, label_id: str) -> str or None:
+        row = self.connection.execute('SELECT n.label_id FROM node_ids i JOIN nodes n ON n.id = i.node '
+                                      'WHERE i.label_id = ?', (label_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def get_canonical_label_ids(self) -> Dict[str, str]:
+        return {label_id: canonical_label_id for label_id, canonical_label_id in self.connection.execute(
+            'SELECT i.label_id, n.label_id FROM node_ids i JOIN nodes n ON n.id = i.node')}
+
+    def get_nodes(self) -> Iterator[Node]:
+        for row in self._iterate_rows('SELECT %s FROM nodes n WHERE n.id > ? ORDER BY n.id LIMIT ?' % NODE_COLUMNS):
+            yield self._to_node(row)
+
+    def _iterate_rows(self, query: str, parameters: Tuple = (), last_id: Any = -1,
+                      page_size: int = 10000) -> Iterator[Tuple]:
+        # Rows are read in pages by their first column, so the tables may be modified while they are iterated. The
+        # query gets the parameters followed by the last value of the previous page and the page size.
+        while True:
+            rows = self.connection.execute(query, parameters + (last_id, page_size)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            for row in rows:
+                yield row
+
+    def get_nodes_by_label(self, label: str) -> List[Node]:
+        return list(self.iterate_nodes_by_label(label))
+
+    def iterate_nodes_by_label(self, label: str) -> Iterator[Node]:
+        for row in self._iterate_rows('SELECT %s FROM label_parts p JOIN nodes n ON n.label = p.label '
+                                      'WHERE p.part = ? AND n.id > ? ORDER BY n.id LIMIT ?' % NODE_COLUMNS, (label,)):
+            yield self._to_node(row)
+
+    def get_node_attribute_keys(self, label: str) -> List[str]:
+        # Only the attributes are read, without creating the nodes
+        keys = set()
+        for _, attributes in self._iterate_rows('SELECT n.id, n.attributes FROM label_parts p JOIN nodes n '
+                                                'ON n.label = p.label WHERE p.part = ? AND n.id > ? ORDER BY n.id '
+                                                'LIMIT ?', (label,)):
+            keys.update(json.loads(attributes).keys())
+        return sorted(keys)
+
+    def get_node_types(self) -> Dict[str, str]:
+        return {label: module for label, module, _ in self.connection.execute(
+            'SELECT label, module, MIN(id) AS first FROM nodes GROUP BY label ORDER BY first')}
+
+    def get_node_count(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM nodes').fetchone()[0]
+
+    def get_edge_count(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM edges').fetchone()[0]
+
+    def node_labels(self) -> List[str]:
+        return [x[0] for x in self.connection.execute('SELECT DISTINCT label FROM nodes ORDER BY label')]
+
+    def edge_labels(self) -> List[str]:
+        return [x[0] for x in self.connection.execute('SELECT DISTINCT label FROM edges ORDER BY label')]
+
+    def add_edge(self, edge: Edge):
+        self.connection.execute('INSERT OR REPLACE INTO edges VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+            edge.id, edge.label, edge.source_label_id, edge.target_label_id, edge.source_node_id,
+            edge.source_node_label, edge.target_node_id, edge.target_node_label, json.dumps(edge.attributes),
+            json.dumps(edge.attributes, sort_keys=True)))
+
+    def get_edges(self) -> Iterator[Edge]:
+        for row in self._iterate_rows('SELECT %s FROM edges e WHERE e.id > ? ORDER BY e.id LIMIT ?' % EDGE_COLUMNS):
+            yield self._to_edge(row)
+
+    def get_edges_by_label(self, label: str) -> List[Edge]:
+        return [self._to_edge(row) for row in self.connection.execute(
+            'SELECT %s FROM edges e WHERE e.label = ? ORDER BY e.id' % EDGE_COLUMNS, (label,))]
+
+    def iterate_resolved_edges(self, label: str) -> Iterator[Tuple[Edge, str or None, str or None]]:
+        for row in self._iterate_rows('%s WHERE e.label = ? AND e.id > ? ORDER BY e.id LIMIT ?' % CANONICAL_EDGES,
+                                      (label,)):
+            yield self._to_edge(row[:-2]), row[-2], row[-1]
+
+    def _get_node_label_ids(self, node: Node) -> List[str]:
+        return ['%s|%s' % (node.label, _id) for _id in node.ids]
+
+    def get_node_edges_by_label(self, node: Node, label: str) -> List[Edge]:
+        label_ids = self._get_node_label_ids(node)
+        result = []
+        for column in ['source', 'target']:
+            result.extend([self._to_edge(row) for row in self.connection.execute(
+                'SELECT %s FROM edges e WHERE e.label = ? AND e.%s IN (%s) ORDER BY e.id' % (
+                    EDGE_COLUMNS, column, self._get_placeholders(label_ids)), [label] + label_ids)])
+        return result
+
+    def get_edges_from_to(self, node_from: Node, node_to: Node, label: str) -> List[Edge]:
+        label_ids = self._get_node_label_ids(node_from)
+        return [self._to_edge(row) for row in self.connection.execute(
+            'SELECT %s FROM edges e WHERE e.label = ? AND e.source IN (%s) ORDER BY e.id' % (
+                EDGE_COLUMNS, self._get_placeholders(label_ids)), [label] + label_ids) if row[4] in node_to.ids]
+
+    def delete_nodes(self, nodes: Iterable[Node]):
+        label_ids = []
+        for node in nodes:
+            label_ids.extend(self._get_node_label_ids(node))
+        self._create_node_table('deleted_nodes', label_ids)
+        self._delete_deleted_nodes()
+
+    def _create_node_table(self, name: str, label_ids: Iterable[str]):
+        # Temp table of the node rows the label ids belong to
+        self.connection.execute('DROP TABLE IF EXISTS temp.%s' % name)
+        self.connection.execute('CREATE TEMP TABLE %s (id INTEGER PRIMARY KEY)' % name)
+        self.connection.executemany('INSERT OR IGNORE INTO %s SELECT node FROM node_ids WHERE label_id = ?' % name,
+                                    [(x,) for x in label_ids])
+
+    def _create_root_table(self, name: str, roots: Iterable[int]):
+        self.connection.execute('DROP TABLE IF EXISTS temp.%s' % name)
+        self.connection.execute('CREATE TEMP TABLE %s (id INTEGER PRIMARY KEY)' % name)
+        self.connection.executemany('INSERT OR IGNORE INTO %s VALUES (?)' % name, [(x,) for x in roots])
+
+    def detach_nodes(self, label_ids: Iterable[str]) -> Set[str]:
+        # Same as in memory, the edges are kept and resolve again once nodes with the same ids are added
+        self._create_node_table('detached_nodes', label_ids)
+        return self._detach_detached_nodes()
+
+    def _detach_roots(self, roots: Iterable[int]) -> Set[str]:
+        self._create_root_table('detached_nodes', roots)
+        return self._detach_detached_nodes()
+
+    def _detach_detached_nodes(self) -> Set[str]:
+        # Detaches the nodes listed in the detached_nodes temp table and returns the label ids of their sets
+        result = {x[0] for x in self.connection.execute(
+            'SELECT label_id FROM node_ids WHERE node IN (SELECT id FROM detached_nodes)')}
+        self.connection.execute('DELETE FROM node_ids WHERE node IN (SELECT id FROM detached_nodes)')
+        self.connection.execute('DELETE FROM nodes WHERE id IN (SELECT id FROM detached_nodes)')
+        self.connection.execute('DROP TABLE temp.detached_nodes')
+        return result
+
+    def _delete_roots(self, roots: Iterable[int]):
+        self._create_root_table('deleted_nodes', roots)
+        self._delete_deleted_nodes()
+
+    def _delete_deleted_nodes(self):
+        # Deletes the nodes listed in the deleted_nodes temp table together with all ids and edges of their sets
+        self.connection.execute('DROP TABLE IF EXISTS temp.deleted_label_ids')
+        self.connection.execute('CREATE TEMP TABLE deleted_label_ids AS SELECT label_id FROM node_ids '
+                                'WHERE node IN (SELECT id FROM deleted_nodes)')
+        self.connection.execute('DELETE FROM edges WHERE source IN (SELECT label_id FROM deleted_label_ids) '
+                                'OR target IN (SELECT label_id FROM deleted_label_ids)')
+        self.connection.execute('DELETE FROM node_ids WHERE node IN (SELECT id FROM deleted_nodes)')
+        self.connection.execute('DELETE FROM nodes WHERE id IN (SELECT id FROM deleted_nodes)')
+        self.connection.execute('DROP TABLE temp.deleted_label_ids')
+        self.connection.execute('DROP TABLE temp.deleted_nodes')
+        self.connection.commit()
+
+    def delete_edges(self, edges: Iterable[Edge]):
+        self.connection.executemany('DELETE FROM edges WHERE id = ?', [(edge.id,) for edge in edges])
+
+    def build_adjacency_index(self) -> AdjacencyIndex:
+        nodes = []
+        node_indices = {}
+        for row in self._iterate_rows('SELECT %s FROM nodes n WHERE n.id > ? ORDER BY n.id LIMIT ?' % NODE_COLUMNS):
+            node_indices[row[0]] = len(nodes)
+            nodes.append(self._to_node(row))
+        edge_endpoints = {}
+        for label, source, target in self.connection.execute(
+                'SELECT label, source, target FROM (%s) WHERE source IS NOT NULL AND target IS NOT NULL ORDER BY id'
+                % RESOLVED_EDGES):
+            if label not in edge_endpoints:
+                edge_endpoints[label] = (array('q'), array('q'))
+            edge_endpoints[label][0].append(node_indices[source])
+            edge_endpoints[label][1].append(node_indices[target])
+        return AdjacencyIndex(nodes, edge_endpoints)
+
+    def get_node_degrees(self) -> Dict[Node, int]:
+        return {self._to_node(row[:-1]): row[-1] for row in self._iterate_rows(
+            'SELECT %s, %s FROM nodes n WHERE n.id > ? ORDER BY n.id LIMIT ?' % (NODE_COLUMNS, NODE_DEGREE))}
+
+    def _get_root_degrees(self) -> Dict[int, int]:
+        return {root: degree for root, degree in self._iterate_rows(
+            'SELECT n.id, %s FROM nodes n WHERE n.id > ? ORDER BY n.id LIMIT ?' % NODE_DEGREE)}
+
+    def prune(self):
+        # Remove singletons
+        self.connection.execute('DROP TABLE IF EXISTS temp.deleted_nodes')
+        self.connection.execute('CREATE TEMP TABLE deleted_nodes (id INTEGER PRIMARY KEY)')
+        self.connection.execute('''
+            INSERT INTO deleted_nodes SELECT id FROM nodes WHERE id NOT IN (
+                SELECT i.node FROM node_ids i JOIN edges e ON e.source = i.label_id
+                UNION SELECT i.node FROM node_ids i JOIN edges e ON e.target = i.label_id)''')
+        self._delete_deleted_nodes()
+
+    def merge_duplicate_edges(self) -> Dict[str, int]:
+        # Keep the last of all identical edges, the signature is the attributes JSON with sorted keys
+        removed_counts = {label: 0 for label in self.edge_labels()}
+        self.connection.execute('DROP TABLE IF EXISTS temp.duplicate_edges')
+        self.connection.execute('''
+            CREATE TEMP TABLE duplicate_edges AS WITH resolved AS (%s)
+            SELECT id, label FROM resolved WHERE id NOT IN (
+                SELECT MAX(id) FROM resolved GROUP BY label, source, target, signature)''' % ENDPOINT_EDGES)
+        for label, count in self.connection.execute('SELECT label, COUNT(*) FROM duplicate_edges GROUP BY label'):
+            removed_counts[label] = count
+        self.connection.execute('DELETE FROM edges WHERE id IN (SELECT id FROM duplicate_edges)')
+        self.connection.execute('DROP TABLE temp.duplicate_edges')
+        self.connection.commit()
+        return removed_counts
+
+    def load(self, file_path: str, processes: int = 1, cache: NetworkCache or None = None):
+        if cache is None:
+            self._load_file(file_path, processes)
+        else:
+            # Cached sources are held in memory only until they are moved into the store
+            network = Network()
+            network.load(file_path, processes, cache)
+            self.merge(network)
+        self.connection.commit()
@@ -2,6 +2,9 @@ from model.node import Node
 
 
 class Variant(Node):
+    __slots__ = ()
+    bulk_prefix = 'dbSNP'
+
     def __init__(self, ids: [str], names: [str]):
         super().__init__(ids, names)
         self.primary_id_prefix = 'dbSNP'
@@ -5,6 +5,8 @@ import urllib.request
 import io
 import json
 
+import mondo_mapper
+
 
 def map_to_simple_id(s: str) -> str or None:
     if s.startswith('http://linkedlifedata.com/resource/umls/id/'):
@@ -67,8 +69,11 @@ with io.open(file, 'r', encoding='utf-8', newline='') as f:
                             reverse_lookup[simple_id] = []
                         reverse_lookup[simple_id].append(node_id)
 
-with io.open('../data/MONDO/lookup.json', 'w', encoding='utf-8', newline='') as f:
-    f.write(json.dumps(lookup, indent=2))
+with io.open(mondo_mapper.lookup_file_path, 'w', encoding='utf-8', newline='') as f:
+    f.write(json.dumps(lookup, separators=(',', ':')))
+
+with io.open(mondo_mapper.reverse_lookup_file_path, 'w', encoding='utf-8', newline='') as f:
+    f.write(json.dumps(reverse_lookup, separators=(',', ':')))
 
-with io.open('../data/MONDO/reverse_lookup.json', 'w', encoding='utf-8', newline='') as f:
-    f.write(json.dumps(reverse_lookup, indent=2))
+# The compiled index is what the fusion loads, the lookups are kept for manual inspection
+mondo_mapper.MondoIndex.from_lookups(lookup, reverse_lookup).save(mondo_mapper.index_file_path)
@@ -1,18 +1,93 @@
 import io
+import os
+import re
 import json
-from typing import List
+from typing import List, Dict, Set, Tuple, Iterable
 
-with io.open('../data/MONDO/lookup.json', 'r', encoding='utf-8', newline='') as f:
-    lookup = json.load(f)
-with io.open('../data/MONDO/reverse_lookup.json', 'r', encoding='utf-8', newline='') as f:
-    reverse_lookup = json.load(f)
+from utils.union_find import UnionFind
+
+index_file_path = '../data/MONDO/index.json'
+lookup_file_path = '../data/MONDO/lookup.json'
+reverse_lookup_file_path = '../data/MONDO/reverse_lookup.json'
+
+
+def _get_prefix(reference: str) -> str:
+    return reference.split(':', 1)[0]
+
+
+class MondoIndex:
+    def __init__(self, shards: Dict[str, Dict[str, List[Tuple[str, str or None, List[str]]]]],
+                 shard_file_paths: Dict[str, str] or None = None):
+        # Shards map every reference with the same id prefix to its terms (MONDO id, label, references). Shards only
+        # listed in the file paths are read when the first reference with their prefix is looked up.
+        self.shards = shards
+        self.shard_file_paths = shard_file_paths or {}
+
+    @staticmethod
+    def from_lookups(lookup: Dict, reverse_lookup: Dict[str, List[str]]) -> 'MondoIndex':
+        shards = {}
+        for reference in sorted(reverse_lookup.keys()):
+            prefix = _get_prefix(reference)
+            if prefix not in shards:
+                shards[prefix] = {}
+            shards[prefix][reference] = [(x, lookup[x]['label'], lookup[x]['refs']) for x in reverse_lookup[reference]]
+        return MondoIndex(shards)
+
+    @staticmethod
+    def load(file_path: str) -> 'MondoIndex' or None:
+        # Only the list of shards is read here. Returns None for indices compiled in the former single file format.
+        with io.open(file_path, 'r', encoding='utf-8', newline='') as f:
+            index = json.load(f)
+        if 'shards' not in index:
+            return None
+        directory = os.path.dirname(file_path)
+        return MondoIndex({}, {prefix: os.path.join(directory, index['shards'][prefix]) for prefix in index['shards']})
+
+    def save(self, file_path: str):
+        directory = os.path.dirname(file_path)
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        shard_file_names = {}
+        for prefix in sorted(self.shards.keys()):
+            shard_file_names[prefix] = '%s_%s.json' % (name, re.sub('[^A-Za-z0-9]', '_', prefix))
+            with io.open(os.path.join(directory, shard_file_names[prefix]), 'w', encoding='utf-8', newline='') as f:
+                json.dump(self.shards[prefix], f, separators=(',', ':'))
+        # The shard list is written last, so it is only newer than the lookups once all shards are complete
+        with io.open(file_path, 'w', encoding='utf-8', newline='') as f:
+            json.dump({'shards': shard_file_names}, f, separators=(',', ':'))
+
+    def get_terms(self, reference: str) -> List[Tuple[str, str or None, List[str]]]:
+        prefix = _get_prefix(reference)
+        if prefix not in self.shards:
+            shard = {}
+            if prefix in self.shard_file_paths:
+                with io.open(self.shard_file_paths[prefix], 'r', encoding='utf-8', newline='') as f:
+                    shard = {key: [tuple(x) for x in value] for key, value in json.load(f).items()}
+            self.shards[prefix] = shard
+        return self.shards[prefix].get(reference, [])
+
+
+_index: MondoIndex or None = None
+
+
+def get_index() -> MondoIndex:
+    global _index
+    # The index is only loaded on first use. Data directories without a compiled index, or one in the former single
+    # file format, fall back to the lookups.
+    if _index is None:
+        if os.path.exists(index_file_path):
+            _index = MondoIndex.load(index_file_path)
+        if _index is None:
+            with io.open(lookup_file_path, 'r', encoding='utf-8', newline='') as f:
+                lookup = json.load(f)
+            with io.open(reverse_lookup_file_path, 'r', encoding='utf-8', newline='') as f:
+                reverse_lookup = json.load(f)
+            _index = MondoIndex.from_lookups(lookup, reverse_lookup)
+    return _index
 
 
 def map_from_to(source_id: str, target_prefix: str) -> str or None:
-    if source_id not in reverse_lookup:
-        return None
-    for mondo_id in reverse_lookup[source_id]:
-        for reference in lookup[mondo_id]['refs']:
+    for _, _, references in get_index().get_terms(source_id):
+        for reference in references:
             if reference.startswith(target_prefix):
                 return reference
     return None
@@ -21,8 +96,34 @@ def map_from_to(source_id: str, target_prefix: str) -> str or None:
 def map_from(source_id: str) -> (List[str], List[str]):
     result_ids = set()
     result_names = set()
-    if source_id in reverse_lookup:
-        for mondo_id in reverse_lookup[source_id]:
-            result_ids.update(lookup[mondo_id]['refs'])
-            result_names.add(lookup[mondo_id]['label'])
+    for _, label, references in get_index().get_terms(source_id):
+        result_ids.update(references)
+        result_names.add(label)
     return sorted(result_ids), result_names
+
+
+def map_many(source_ids: Iterable[str]) -> List[Tuple[List[str], Set[str]]]:
+    # Returns the ids and names of each equivalence group. Mapped ids of different source ids sharing any id end up
+    # in the same group, the same as merging the results of map_from for every source id would.
+    index = get_index()
+    groups = UnionFind()
+    terms = {}
+    for source_id in source_ids:
+        for term in index.get_terms(source_id):
+            references = term[2]
+            if not references:
+                continue
+            terms[term[0]] = term
+            root = groups.add(references[0])
+            for reference in references[1:]:
+                groups.add(reference)
+                root = groups.union(root, reference)
+    result = {}
+    for mondo_id in sorted(terms.keys()):
+        _, label, references = terms[mondo_id]
+        root = groups.find(references[0])
+        if root not in result:
+            result[root] = (set(), set())
+        result[root][0].update(references)
+        result[root][1].add(label)
+    return [(sorted(ids), names) for ids, names in result.values()]
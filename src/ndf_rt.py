@@ -5,6 +5,7 @@ import xml.etree.ElementTree
 import urllib.request
 import zipfile
 import re
+from utils import graph_utils
 from model.network import Network
 from model.drug import Drug
 from model.disease import Disease
@@ -109,4 +110,4 @@ for concept_code in sorted(concept_defs.keys()):
         disease = Disease(disease_ids, disease_names)
         network.add_node(disease)
 
-network.save('../data/NDF-RT/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/NDF-RT'))
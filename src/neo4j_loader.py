@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+import io
+import json
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Iterator, Iterable, Tuple, Any
+
+try:
+    from neo4j import GraphDatabase, basic_auth
+except ImportError:
+    # The driver is only needed to load into a running database, the neo4j-admin import works without it
+    GraphDatabase = None
+    basic_auth = None
+
+import fusion
+from utils import graph_utils
+from model.network import Network
+
+
+def create_driver(config: Dict, workers: int):
+    if GraphDatabase is None:
+        raise ImportError('The neo4j driver is required to load a running database, pip install neo4j')
+    uri = config['Neo4j']['bolt-uri'] if 'bolt-uri' in config['Neo4j'] else 'bolt://localhost:7687'
+    # One pooled connection per worker, sessions borrow them for each batch
+    return GraphDatabase.driver(uri, auth=basic_auth(config['Neo4j']['user'], config['Neo4j']['password']),
+                                max_connection_pool_size=max(workers, 1))
+
+
+def _quote(name: str) -> str:
+    return '`%s`' % name.replace('`', '``')
+
+
+def _convert_value(value: Any, type_name: str) -> Any:
+    # Values are read the same way as for the csv files and converted to the type of their csv column
+    if value is None:
+        return None
+    if type_name == 'int':
+        # Same as neo4j-admin, which would reject the row, a malformed value must not abort the load. It is kept as
+        # string instead.
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return str(value)
+    if type_name == 'boolean':
+        return value == 'true'
+    if type_name == 'string[]':
+        return value.split(';') if value else []
+    return str(value)
+
+
+def get_node_query(label: str) -> str:
+    parts = label.split(';')
+    # Nodes are matched by the first part of their label, which has a unique constraint on _id. Every node is stamped
+    # with the load it was last written by.
+    query = 'UNWIND $rows AS row MERGE (n:%s {_id: row._id}) SET n = row, n._load = $load' % _quote(parts[0])
+    if len(parts) > 1:
+        query += ' SET n:%s' % ':'.join([_quote(x) for x in parts[1:]])
+    return query
+
+
+def get_node_batches(network: Network, batch_size: int) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for n in network.get_nodes():
+        row = {key: value for key, value in n.attributes.items() if value is not None}
+        row.update({'label_id': n.label_id, '_id': n.id, 'ids': sorted(n.ids), 'names': sorted(n.names)})
+        if n.label not in groups:
+            groups[n.label] = []
+        groups[n.label].append(row)
+        if len(groups[n.label]) >= batch_size:
+            yield get_node_query(n.label), groups[n.label]
+            groups[n.label] = []
+    for label in sorted(groups.keys()):
+        if len(groups[label]) > 0:
+            yield get_node_query(label), groups[label]
+
+
+def get_relationship_query(label: str, source_label: str, target_label: str) -> str:
+    return ('UNWIND $rows AS row MATCH (s:%s {_id: row.source}), (t:%s {_id: row.target}) '
+            'MERGE (s)-[r:%s {_key: row.key}]->(t) SET r = row.properties, r._key = row.key, r._load = $load') % (
+        _quote(source_label), _quote(target_label), _quote(label))
+
+
+def get_relationship_key(properties: Dict[str, Any]) -> str:
+    # Relationships of the same type between the same nodes only differ in their properties
+    return hashlib.sha1(json.dumps(properties, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def get_relationship_batches(network: Network, batch_size: int) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    # Batches of a relationship type are further split by the labels of their endpoints, so both endpoints are
+    # matched through the unique constraint on _id
+    for label in fusion.edge_metadata:
+        metadata = fusion.edge_metadata[label]
+        getters = fusion.get_attribute_getters(metadata)
+        columns = [x.split(':') for x in metadata[0]]
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for e, source_label_id, target_label_id in network.iterate_resolved_edges(label):
+            source_label, source_id = source_label_id.split('|', 1)
+            target_label, target_id = target_label_id.split('|', 1)
+            properties = {}
+            for (name, type_name), getter in zip(columns, getters):
+                value = _convert_value(getter(e.attributes), type_name)
+                if value is not None:
+                    properties[name] = value
+            key = (source_label.split(';')[0], target_label.split(';')[0])
+            if key not in groups:
+                groups[key] = []
+            groups[key].append({'source': source_id, 'target': target_id, 'key': get_relationship_key(properties),
+                                'properties': properties})
+            if len(groups[key]) >= batch_size:
+                yield get_relationship_query(label, *key), groups[key]
+                groups[key] = []
+        for key in sorted(groups.keys()):
+            if len(groups[key]) > 0:
+                yield get_relationship_query(label, *key), groups[key]
+
+
+def _write_batch(driver, query: str, rows: List[Dict[str, Any]], load: int):
+    with driver.session() as session:
+        session.write_transaction(lambda tx: tx.run(query, {'rows': rows, 'load': load}).consume())
+
+
+def _write_batches(driver, batches: Iterable[Tuple[str, List[Dict[str, Any]]]], load: int, workers: int) -> int:
+    # Only two batches per worker are built ahead, so the rows of the whole network are never held at once
+    count = 0
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        pending = set()
+        for query, rows in batches:
+            if len(pending) >= max(workers, 1) * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(executor.submit(_write_batch, driver, query, rows, load))
+            count += 1
+        for future in pending:
+            future.result()
+    return count
+
+
+def _delete_stale(driver, query: str, load: int, batch_size: int) -> int:
+    # Deleted in batches to keep each transaction small while the database stays online
+    count = 0
+    with driver.session() as session:
+        while True:
+            deleted = session.write_transaction(
+                lambda tx: tx.run(query, {'load': load, 'limit': batch_size}).single()[0])
+            if deleted == 0:
+                return count
+            count += deleted
+
+
+def load_network(network: Network, driver, batch_size: int = 10000, workers: int = 1, load: int or None = None):
+    # Nodes and relationships are merged into the running database and stamped with this load. Only afterwards,
+    # everything not written by this load is removed, so queries never miss data that is still part of the network.
+    load = load if load is not None else int(time.time() * 1000)
+    with driver.session() as session:
+        for query in fusion.get_constraint_queries(network):
+            session.run(query).consume()
+    node_batch_count = _write_batches(driver, get_node_batches(network, batch_size), load, workers)
+    print('[INFO] Loaded %s node batches' % node_batch_count)
+    relationship_batch_count = _write_batches(driver, get_relationship_batches(network, batch_size), load, workers)
+    print('[INFO] Loaded %s relationship batches' % relationship_batch_count)
+    deleted_relationship_count = _delete_stale(
+        driver, 'MATCH ()-[r]->() WHERE coalesce(r._load, -1) <> $load WITH r LIMIT $limit DELETE r '
+                'RETURN count(r)', load, batch_size)
+    print('[INFO] Deleted %s stale relationships' % deleted_relationship_count)
+    deleted_node_count = _delete_stale(
+        driver, 'MATCH (n) WHERE coalesce(n._load, -1) <> $load WITH n LIMIT $limit DETACH DELETE n '
+                'RETURN count(n)', load, batch_size)
+    print('[INFO] Deleted %s stale nodes' % deleted_node_count)
+
+
+if __name__ == '__main__':
+    with io.open('../data/config.json', 'r', encoding='utf-8', newline='') as f:
+        config = json.load(f)
+    bolt_workers = config['bolt-workers'] if 'bolt-workers' in config else 1
+    bolt_batch_size = config['bolt-batch-size'] if 'bolt-batch-size' in config else 10000
+    print('[INFO] Load fused network')
+    fused_network = Network()
+    fused_network.load(graph_utils.get_graph_file_path(config['output-path']))
+    bolt_driver = create_driver(config, bolt_workers)
+    try:
+        load_network(fused_network, bolt_driver, bolt_batch_size, bolt_workers)
+    finally:
+        bolt_driver.close()
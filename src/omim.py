@@ -2,6 +2,7 @@
 
 import io
 import csv
+from utils import graph_utils
 from model.network import Network
 from model.gene import Gene
 from model.disease import Disease
@@ -78,4 +79,4 @@ with io.open('../data/OMIM/filtered_associations.csv', 'r', encoding='utf-8', ne
         }
         network.add_edge(Edge(gene, disease, 'ASSOCIATES_WITH', rel))
 
-network.save('../data/OMIM/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/OMIM'))
@@ -8,6 +8,7 @@ import zipfile
 import urllib.request
 from typing import List, Set, Tuple
 
+from utils import graph_utils
 from model.adr import AdverseDrugReaction
 from model.edge import Edge
 from model.gene import Gene
@@ -272,4 +273,4 @@ with open_file_in_zip('../data/PharmGKB/annotations.zip', 'clinical_ann_metadata
             network.add_node(variant)
             network.add_edge(Edge(variant, adr, 'ASSOCIATED_WITH_ADR', {'source': 'PharmGKB'}))
 
-network.save('../data/PharmGKB/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/PharmGKB'))
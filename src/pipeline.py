@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import sys
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Callable
+
+import fusion
+from utils import graph_utils
+
+
+class Stage:
+    def __init__(self, script: str, inputs: List[str], outputs: List[str]):
+        self.script = script
+        # The script itself is an input as well, so changes to the importer run it again
+        self.inputs = [script] + inputs
+        self.outputs = outputs
+
+    @property
+    def name(self) -> str:
+        return os.path.splitext(os.path.basename(self.script))[0]
+
+
+def get_importer_stages() -> List[Stage]:
+    importer_inputs = {
+        '../data/EBI-GOA-miRNA': ('ebi_goa_mirna.py', ['query.txt', 'ensembl.txt', 'hgnc.tsv']),
+        '../data/miRTarBase': ('mirtarbase.py', ['hsa_MTI.xlsx', 'tarbase.tsv']),
+        '../data/RNAInter': ('rnainter.py', ['2804_res.txt', 'hgnc.tsv', 'tarbase.tsv', 'all_hgnc_ids.txt']),
+        '../data/DisGeNet': ('disgenet.py', ['curated_gene_disease_associations.tsv',
+                                             'curated_variant_disease_associations.tsv']),
+        '../data/DrugBank': ('drugbank.py', ['drugbank_all_full_database.xml.zip']),
+        '../data/DrugCentral': ('drugcentral.py', ['drugcentral_mappings.csv', 'drugcentral_indications.csv',
+                                                   'drugcentral_contraindications.csv']),
+        # The release file name is only known after asking the GWAS Catalog, the stage reruns if its graph is missing
+        '../data/GWAS-Catalog': ('gwas_catalog.py', []),
+        '../data/HGNC': ('hgnc.py', ['hgnc_complete_set.txt']),
+        '../data/HPO': ('hpo.py', ['OMIM_FREQUENT_FEATURES_diseases_to_genes_to_phenotypes.txt']),
+        '../data/MED-RT': ('med_rt.py', ['Core_MEDRT_XML.xml']),
+        '../data/NDF-RT': ('ndf_rt.py', ['NDFRT_Public_All.xml']),
+        '../data/OMIM': ('omim.py', ['genemap2.txt']),
+        '../data/HuGE-Navigator': ('huge_navigator.py', ['Disease-GeneID.txt']),
+        '../data/SIDER': ('sider.py', ['meddra_all_indications.tsv', 'drug_names.tsv']),
+        '../data/DGIdb': ('dgidb.py', ['interactions.tsv']),
+        '../data/Westra_etal_2017': ('westra_etal_2017.py', ['2012-12-21-CisAssociationsProbeLevelFDR0.5.txt',
+                                                             '2012-12-21-TransEQTLsFDR0.5.txt']),
+        '../data/SuperDrug2': ('superdrug2.py', ['all_drugs_extlinks.csv']),
+        '../data/UniprotKB': ('uniprotkb.py', ['HUMAN_9606_idmapping.dat']),
+        '../data/GO': ('gene_ontology.py', ['goa_human.gaf', 'go.owl']),
+        '../data/PharmGKB': ('pharmgkb.py', ['drugs.zip', 'genes.zip', 'variants.zip', 'phenotypes.zip',
+                                             'annotations.zip']),
+        '../data/PubMed': ('pubmed.py', ['drug_disease.csv']),
+    }
+    stages = []
+    for directory in fusion.graph_directories:
+        script, inputs = importer_inputs[directory]
+        stages.append(Stage(script, [os.path.join(directory, x) for x in inputs],
+                            [graph_utils.get_graph_file_path(directory)]))
+    return stages
+
+
+def get_stages(config: Dict) -> List[Stage]:
+    mondo_stage = Stage('mondo.py', ['../data/MONDO/mondo.json'], [
+        '../data/MONDO/lookup.json', '../data/MONDO/reverse_lookup.json', '../data/MONDO/index.json'])
+    importer_stages = get_importer_stages()
+    fusion_inputs = [mondo_stage.outputs[-1]]
+    for stage in importer_stages:
+        fusion_inputs.extend(stage.outputs)
+    fusion_stage = Stage('fusion.py', fusion_inputs, [graph_utils.get_graph_file_path(config['output-path'])])
+    return [mondo_stage] + importer_stages + [fusion_stage]
+
+
+def is_up_to_date(stage: Stage) -> bool:
+    # Missing inputs are downloaded by the importers themselves, so their stages always have to run
+    if not all([os.path.exists(x) for x in stage.inputs + stage.outputs]):
+        return False
+    newest_input = max([os.path.getmtime(x) for x in stage.inputs])
+    return all([os.path.getmtime(x) >= newest_input for x in stage.outputs])
+
+
+def run_stage(stage: Stage) -> bool:
+    # The output is collected per stage, as parallel stages would interleave their lines otherwise
+    result = subprocess.run([sys.executable, stage.script], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    print('[INFO] Output of %s:\n%s' % (stage.name, result.stdout.decode('utf-8', errors='replace')))
+    return result.returncode == 0
+
+
+def run_pipeline(stages: List[Stage], workers: int, runner: Callable[[Stage], bool] = run_stage) -> Dict[str, str]:
+    # Stages depend on the stages producing any of their inputs. Each stage starts as soon as all of its
+    # dependencies are done, independent stages run in parallel. Returns the status of every stage.
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            producers[output] = stage
+    dependencies = {stage: {producers[x] for x in stage.inputs if x in producers} for stage in stages}
+    status: Dict[str, str] = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        while len(status) < len(stages):
+            finished_count = len(status)
+            for stage in stages:
+                if stage.name in status or stage in running.values():
+                    continue
+                dependency_status = [status.get(x.name) for x in dependencies[stage]]
+                if any([x == 'failed' or x == 'blocked' for x in dependency_status]):
+                    print('[WARN] Skip %s as a stage it depends on failed' % stage.name)
+                    status[stage.name] = 'blocked'
+                elif all([x is not None for x in dependency_status]):
+                    if is_up_to_date(stage):
+                        print('[INFO] Skip %s, outputs are up to date' % stage.name)
+                        status[stage.name] = 'skipped'
+                    else:
+                        print('[INFO] Run %s' % stage.name)
+                        running[executor.submit(runner, stage)] = stage
+            if not running:
+                if len(status) == finished_count:
+                    raise ValueError('The stages have cyclic dependencies')
+                continue
+            done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                status[stage.name] = 'done' if future.result() else 'failed'
+                print('[INFO] Stage %s %s' % (stage.name, status[stage.name]))
+    return status
+
+
+if __name__ == '__main__':
+    with io.open('../data/config.json', 'r', encoding='utf-8', newline='') as f:
+        config = json.load(f)
+    pipeline_workers = config['pipeline-workers'] if 'pipeline-workers' in config else 0
+    pipeline_status = run_pipeline(get_stages(config), pipeline_workers if pipeline_workers > 0 else os.cpu_count())
+    sys.exit(1 if 'failed' in pipeline_status.values() or 'blocked' in pipeline_status.values() else 0)
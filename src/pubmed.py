@@ -2,6 +2,7 @@
 
 import io
 import csv
+from utils import graph_utils
 from model.network import Network
 from model.drug import Drug
 from model.disease import Disease
@@ -19,4 +20,4 @@ with io.open('../data/PubMed/drug_disease.csv', 'r', encoding='utf-8', newline='
         network.add_node(disease)
         network.add_edge(Edge(drug, disease, row[2], {'source': 'PubMed', 'pmid': row[5]}))
 
-network.save('../data/PubMed/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/PubMed'))
@@ -5,6 +5,7 @@ import urllib.request
 import zipfile
 import io
 import csv
+from utils import graph_utils
 from model.circrna import CircRNA
 from model.edge import Edge
 from model.erna import ERNA
@@ -214,4 +215,4 @@ if __name__ == '__main__':
                     e = Edge(interactor_a, interactor_b, 'REGULATES', {'source': 'RNAInter'})
                     network.add_edge(e)
 
-    network.save('../data/RNAInter/graph.json')
+    network.save(graph_utils.get_graph_file_path('../data/RNAInter'))
@@ -5,6 +5,7 @@ import urllib.request
 import io
 import csv
 
+from utils import graph_utils
 from model.edge import Edge
 from model.network import Network
 from model.drug import Drug
@@ -60,4 +61,4 @@ with io.open(file, 'r', encoding='utf-8', newline='') as f:
         network.add_node(disease)
         network.add_edge(Edge(drug, disease, 'INDICATES', {'source': 'SIDER'}))
 
-network.save('../data/SIDER/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/SIDER'))
@@ -4,6 +4,7 @@ import os.path
 import urllib.request
 import io
 import csv
+from utils import graph_utils
 from model.network import Network
 from model.drug import Drug
 import gzip
@@ -59,4 +60,4 @@ with io.open(file, 'r', encoding='utf-8', newline='') as f:
         if len(drug_ids) > 1:
             network.add_node(Drug(drug_ids, [row[1]]))
 
-network.save('../data/SuperDrug2/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/SuperDrug2'))
@@ -0,0 +1,31 @@
+import unittest
+from model import node, edge, network, adjacency
+
+
+class DummyNode(node.Node):
+    def __init__(self, ids: [str], names: [str]):
+        super().__init__(ids, names)
+        self.primary_id_prefix = 'TEST'
+
+
+class TestMethods(unittest.TestCase):
+    def test_adjacency_index(self):
+        n1 = DummyNode(['TEST:1'], [])
+        n2 = DummyNode(['TEST:2', 'OTHER:2'], [])
+        n3 = DummyNode(['TEST:3'], [])
+        graph = network.Network()
+        for n in [n1, n2, n3]:
+            graph.add_node(n)
+        graph.add_edge(edge.Edge(n1, n3, 'LINKS', {}))
+        graph.add_edge(edge.Edge(n1, ('OTHER:2', 'DummyNode'), 'LINKS', {}))
+        graph.add_edge(edge.Edge(n2, n3, 'TARGETS', {}))
+        index = graph.build_adjacency_index()
+        self.assertEqual(index.edge_labels(), ['LINKS', 'TARGETS'])
+        self.assertEqual(index.neighbors(n1, 'LINKS'), [n2, n3])
+        self.assertEqual(index.neighbors(n3, 'LINKS', adjacency.INCOMING), [n1])
+        self.assertEqual(index.degree(n1, 'LINKS'), 2)
+        self.assertEqual(index.degree(n1, 'TARGETS'), 0)
+        self.assertEqual(list(index.degrees('LINKS', adjacency.INCOMING)), [0, 1, 1])
+        self.assertTrue(index.has_edge(n1, n2, 'LINKS'))
+        self.assertFalse(index.has_edge(n2, n1, 'LINKS'))
+        self.assertFalse(index.has_edge(n1, n2, 'TARGETS'))
@@ -0,0 +1,62 @@
+import json
+import unittest
+from model import node, edge, network, fusion_state
+
+
+class DummyNode1(node.Node):
+    def __init__(self, ids: [str], names: [str]):
+        super().__init__(ids, names)
+        self.primary_id_prefix = 'TEST1'
+
+
+class DummyNode2(node.Node):
+    def __init__(self, ids: [str], names: [str]):
+        super().__init__(ids, names)
+        self.primary_id_prefix = 'OTHER'
+
+
+def create_graph(nodes, edges) -> network.Network:
+    graph = network.Network()
+    for n in nodes:
+        graph.add_node(n)
+    for source, target in edges:
+        graph.add_edge(edge.Edge(source, target, 'LINKS', {}))
+    return graph
+
+
+def get_records(graph: network.Network) -> ([str], [str]):
+    return (sorted([json.dumps(x, sort_keys=True) for x in graph.get_node_records()]),
+            sorted([json.dumps(x, sort_keys=True) for x in graph.get_edge_records()]))
+
+
+class TestMethods(unittest.TestCase):
+    def test_update(self):
+        sources = {
+            'a': lambda: create_graph([DummyNode1(['TEST1:1'], ['a']), DummyNode2(['OTHER:1'], [])],
+                                      [(DummyNode1(['TEST1:1'], []), DummyNode2(['OTHER:1'], []))]),
+            'b': lambda: create_graph([DummyNode1(['TEST1:1', 'OTHER:x'], ['b']), DummyNode1(['TEST1:2'], [])], []),
+            'c': lambda: create_graph([DummyNode1(['TEST1:3', 'OTHER:x'], ['c'])],
+                                      [(DummyNode1(['TEST1:3'], []), DummyNode2(['OTHER:1'], []))])
+        }
+        loaded = []
+
+        def load_graphs(graphs):
+            loaded.extend(graphs)
+            return [sources[x]() for x in graphs]
+
+        state = fusion_state.FusionState()
+        self.assertEqual(state.update([('a', '1'), ('b', '1'), ('c', '1')], load_graphs), (['a', 'b', 'c'], True))
+        self.assertEqual(len(list(state.network.get_nodes())), 3)
+        self.assertEqual(state.update([('a', '1'), ('b', '1'), ('c', '1')], load_graphs), ([], False))
+        # The new release of b no longer links TEST1:1 and TEST1:3
+        sources['b'] = lambda: create_graph([DummyNode1(['TEST1:1'], ['b2'])],
+                                            [(DummyNode1(['TEST1:1'], []), DummyNode1(['TEST1:1'], []))])
+        del loaded[:]
+        self.assertEqual(state.update([('a', '1'), ('b', '2'), ('c', '1')], load_graphs), (['b'], True))
+        self.assertEqual(loaded, ['b', 'a', 'c'])
+        expected = fusion_state.FusionState()
+        expected.update([('a', '1'), ('b', '2'), ('c', '1')], load_graphs)
+        self.assertEqual(get_records(state.network), get_records(expected.network))
+        self.assertEqual(len(list(state.network.get_nodes())), 3)
+        self.assertEqual(state.update([('a', '1'), ('c', '1')], load_graphs), ([], True))
+        self.assertEqual(len(state.network.get_edges_by_label('LINKS')), 2)
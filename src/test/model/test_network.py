@@ -1,8 +1,10 @@
 import io
 import os
 import json
+import shutil
+import tempfile
 import unittest
-from model import node, edge, network
+from model import node, edge, network, network_cache
 
 
 class DummyNode1(node.Node):
@@ -50,6 +52,178 @@ class TestMethods(unittest.TestCase):
             graph.load_from_dict(g)
         self.assertEqual(len(list(graph.get_nodes())), 3)
         self.assertEqual(len(list(graph.get_edges_by_label('LINKS'))), 3)
+        graph = network.Network()
+        graph.load_from_json(self.temp_file_path)
+        self.assertEqual(len(list(graph.get_nodes())), 3)
+        self.assertEqual(len(list(graph.get_edges_by_label('LINKS'))), 3)
+
+    def test_identity_resolution(self):
+        graph = network.Network()
+        graph.add_node(DummyNode1(['TEST1:1', 'OTHER:a'], ['a']))
+        graph.add_node(DummyNode1(['OTHER:b'], ['b']))
+        graph.add_node(DummyNode1(['OTHER:b', 'OTHER:a'], ['c']))
+        graph.add_node(DummyNode1(['OTHER:c'], []))
+        self.assertEqual(len(list(graph.get_nodes())), 2)
+        self.assertEqual(graph.get_canonical_label_id('DummyNode1|OTHER:b'), 'DummyNode1|TEST1:1')
+        self.assertIsNone(graph.get_canonical_label_id('DummyNode1|TEST1:2'))
+        self.assertEqual(graph.get_canonical_label_ids(), {
+            'DummyNode1|TEST1:1': 'DummyNode1|TEST1:1', 'DummyNode1|OTHER:a': 'DummyNode1|TEST1:1',
+            'DummyNode1|OTHER:b': 'DummyNode1|TEST1:1', 'DummyNode1|OTHER:c': 'DummyNode1|OTHER:c'})
+        node = graph.get_node_by_id('OTHER:a', 'DummyNode1')
+        self.assertEqual(node.ids, {'TEST1:1', 'OTHER:a', 'OTHER:b'})
+        self.assertEqual(node.names, {'a', 'b', 'c'})
+        self.assertIs(graph.nodes['DummyNode1|OTHER:b'], node)
+        graph.delete_node(node)
+        self.assertIsNone(graph.get_node_by_id('TEST1:1', 'DummyNode1'))
+        self.assertEqual(len(graph.nodes), 1)
+
+    def test_edge_lookups(self):
+        n1 = DummyNode1(['TEST1:123', 'OTHER:abc'], [])
+        n2 = DummyNode2(['OTHER:abc'], [])
+        graph = network.Network()
+        graph.add_node(n1)
+        graph.add_node(n2)
+        graph.add_edge(edge.Edge(n1, n2, 'LINKS', {}))
+        graph.add_edge(edge.Edge(n2, n1, 'LINKS', {}))
+        graph.add_node(DummyNode1(['OTHER:abc', 'TEST1:456'], []))
+        node = graph.get_node_by_id('TEST1:456', 'DummyNode1')
+        self.assertEqual(len(graph.get_node_edges_by_label(node, 'LINKS')), 2)
+        self.assertEqual(len(graph.get_edges_from_to(node, n2, 'LINKS')), 1)
+        self.assertEqual(len(graph.get_edges_from_to(n2, node, 'LINKS')), 1)
+        self.assertEqual(graph.get_node_edges_by_label(node, 'OTHER'), [])
+
+    def test_label_index(self):
+        class DummyRNA(DummyNode1):
+            pass
+
+        graph = network.Network()
+        graph.add_node(DummyNode1(['TEST1:1'], []))
+        graph.add_node(DummyRNA(['TEST1:2'], []))
+        graph.add_node(DummyRNA(['TEST1:2', 'TEST1:3'], []))
+        graph.add_node(DummyNode2(['OTHER:1'], []))
+        self.assertEqual(graph.node_labels(), ['DummyNode1', 'DummyNode2', 'DummyRNA;DummyNode1'])
+        self.assertEqual(len(graph.get_nodes_by_label('DummyNode1')), 2)
+        self.assertEqual(len(graph.get_nodes_by_label('DummyRNA')), 1)
+        self.assertEqual(graph.get_nodes_by_label('DummyRNA;DummyNode1'), [])
+        graph.delete_node(graph.get_node_by_id('TEST1:3', 'DummyRNA;DummyNode1'))
+        self.assertEqual(graph.get_nodes_by_label('DummyRNA'), [])
+        self.assertEqual(graph.node_labels(), ['DummyNode1', 'DummyNode2'])
+
+    def test_merge_duplicate_edges(self):
+        n1 = DummyNode1(['TEST1:1', 'OTHER:1'], [])
+        n2 = DummyNode2(['OTHER:2'], [])
+        graph = network.Network()
+        graph.add_node(n1)
+        graph.add_node(n2)
+        graph.add_edge(edge.Edge(n1, n2, 'LINKS', {'actions': ['a', 'b'], 'source': 'X'}))
+        graph.add_edge(edge.Edge(n1, n2, 'LINKS', {'actions': ['a'], 'source': 'X'}))
+        graph.add_edge(edge.Edge(n2, n1, 'LINKS', {'actions': ['a'], 'source': 'X'}))
+        last = edge.Edge(DummyNode1(['OTHER:1'], []), n2, 'LINKS', {'source': 'X', 'actions': ['a', 'b']})
+        graph.add_edge(last)
+        graph.add_edge(edge.Edge(n2, n1, 'OTHER', {}))
+        self.assertEqual(graph.merge_duplicate_edges(), {'LINKS': 1, 'OTHER': 0})
+        self.assertEqual(len(graph.get_edges_by_label('LINKS')), 3)
+        self.assertIn(last, graph.get_edges_by_label('LINKS'))
+
+    def test_prune(self):
+        n1 = DummyNode1(['TEST1:1'], [])
+        n2 = DummyNode1(['TEST1:2'], [])
+        n3 = DummyNode1(['TEST1:3', 'OTHER:3'], [])
+        n4 = DummyNode2(['OTHER:4'], [])
+        graph = network.Network()
+        for n in [n1, n2, n3, n4]:
+            graph.add_node(n)
+        e1 = edge.Edge(n1, n2, 'LINKS', {})
+        graph.add_edge(e1)
+        graph.add_edge(edge.Edge(n2, ('OTHER:3', 'DummyNode1'), 'LINKS', {}))
+        self.assertEqual(graph.get_node_degrees()[n2], 2)
+        graph.prune()
+        self.assertEqual(len(list(graph.get_nodes())), 3)
+        graph.delete_edges([e1])
+        graph.delete_nodes([n3])
+        self.assertEqual(graph.get_node_degrees(), {n1: 0, n2: 0})
+        graph.prune()
+        self.assertEqual(list(graph.get_nodes()), [])
+
+    def test_merge(self):
+        n1 = DummyNode1(['TEST1:1'], ['a'])
+        n2 = DummyNode2(['OTHER:2'], [])
+        graph = network.Network()
+        graph.add_node(n1)
+        graph.add_node(n2)
+        graph.add_edge(edge.Edge(n1, n2, 'LINKS', {}))
+        other = network.Network()
+        n3 = DummyNode1(['TEST1:1', 'OTHER:1'], ['b'])
+        other.add_node(n3)
+        other.add_node(DummyNode2(['OTHER:3'], []))
+        other.add_edge(edge.Edge(n3, n2, 'LINKS', {}))
+        graph.merge(other)
+        self.assertEqual(len(list(graph.get_nodes())), 3)
+        self.assertEqual(len(graph.edges), 2)
+        self.assertEqual(graph.get_node_by_id('OTHER:1', 'DummyNode1').names, {'a', 'b'})
+        self.assertEqual(len(graph.get_node_edges_by_label(n1, 'LINKS')), 2)
+        self.assertEqual(list(other.get_nodes()), [])
+
+    def test_save_matches_to_dict(self):
+        n1 = DummyNode1(['TEST1:1', 'OTHER:1'], ['a\nb', '\u00e4'])
+        n1.attributes['values'] = [1, {'x': None}]
+        n2 = DummyNode2(['OTHER:2'], [])
+        graph = network.Network()
+        graph.save(self.temp_file_path)
+        with io.open(self.temp_file_path, 'r', encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), json.dumps(graph.to_dict()))
+        graph.add_node(n1)
+        graph.add_node(n2)
+        graph.add_edge(edge.Edge(n1, n2, 'LINKS', {'actions': ['a', 'b']}))
+        for indent, compact, kwargs in [(False, False, {}), (True, False, {'indent': 2}),
+                                        (False, True, {'separators': (',', ':')})]:
+            graph.save(self.temp_file_path, indent=indent, compact=compact)
+            with io.open(self.temp_file_path, 'r', encoding='utf-8', newline='') as f:
+                self.assertEqual(f.read(), json.dumps(graph.to_dict(), **kwargs))
+
+    def test_jsonl(self):
+        self.temp_file_path = 'genconet_testgraph.jsonl'
+        graph = network.Network()
+        for i in range(0, 20):
+            graph.add_node(DummyNode1(['TEST1:%s' % i], ['n%s' % i]))
+            graph.add_node(DummyNode2(['OTHER:%s' % i], []))
+            graph.add_edge(edge.Edge(DummyNode1(['TEST1:%s' % i], []), DummyNode2(['OTHER:%s' % i], []), 'LINKS',
+                                     {'index': i}))
+        graph.save(self.temp_file_path)
+        with io.open(self.temp_file_path, 'r', encoding='utf-8', newline='') as f:
+            self.assertEqual(len(f.readlines()), 61)
+        for processes in [1, 3]:
+            loaded = network.Network()
+            loaded.load(self.temp_file_path, processes)
+            self.assertEqual(loaded.to_dict(), graph.to_dict())
+
+    def test_load_cached(self):
+        cache_directory = tempfile.mkdtemp()
+        try:
+            cache = network_cache.NetworkCache(cache_directory, 1 << 20)
+            graph = network.Network()
+            graph.add_node(DummyNode1(['TEST1:1'], []))
+            graph.add_node(DummyNode2(['OTHER:1'], []))
+            graph.add_edge(edge.Edge(DummyNode1(['TEST1:1'], []), DummyNode2(['OTHER:1'], []), 'LINKS', {}))
+            graph.save(self.temp_file_path)
+            for _ in range(0, 2):
+                loaded = network.Network()
+                loaded.load(self.temp_file_path, cache=cache)
+                self.assertEqual(loaded.to_dict(), graph.to_dict())
+            self.assertEqual(len([x for x in os.listdir(cache_directory) if x.endswith('.pickle')]), 1)
+            new_edge = edge.Edge(DummyNode1(['TEST1:1'], []), DummyNode2(['OTHER:1'], []), 'LINKS', {})
+            self.assertNotIn(new_edge.id, loaded.edges)
+            graph.add_node(DummyNode2(['OTHER:2'], []))
+            graph.save(self.temp_file_path)
+            loaded = network.Network()
+            loaded.load(self.temp_file_path, cache=cache)
+            self.assertEqual(len(list(loaded.get_nodes())), 3)
+            cache.max_size = 0
+            cache.evict()
+            self.assertEqual(len([x for x in os.listdir(cache_directory) if x.endswith('.pickle')]), 1)
+        finally:
+            shutil.rmtree(cache_directory)
 
     def tearDown(self):
-        os.remove(self.temp_file_path)
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
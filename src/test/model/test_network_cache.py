@@ -0,0 +1,63 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from model import node, network, network_cache
+
+
+class DummyNode(node.Node):
+    def __init__(self, ids: [str], names: [str]):
+        super().__init__(ids, names)
+        self.primary_id_prefix = 'TEST'
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = network_cache.NetworkCache(os.path.join(self.directory, 'cache'), 0)
+
+    def test_concurrent_eviction(self):
+        graph_file_paths = []
+        for i in range(0, 8):
+            graph = network.Network()
+            graph.add_node(DummyNode(['TEST:%s' % i], []))
+            graph_file_paths.append(os.path.join(self.directory, 'graph%s.json' % i))
+            graph.save(graph_file_paths[-1])
+        errors = []
+        barrier = threading.Barrier(len(graph_file_paths))
+
+        def load(graph_file_path: str):
+            try:
+                barrier.wait()
+                # Every put evicts all other entries, while the other threads still list, read and touch them
+                for _ in range(0, 20):
+                    loaded = network.Network()
+                    loaded.load(graph_file_path, cache=self.cache)
+                    self.cache.evict()
+                    self.assertEqual(loaded.get_node_count(), 1)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=load, args=(x,)) for x in graph_file_paths]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_missing_entry(self):
+        graph = network.Network()
+        graph.add_node(DummyNode(['TEST:1'], []))
+        graph_file_path = os.path.join(self.directory, 'graph.json')
+        graph.save(graph_file_path)
+        self.cache.put(graph_file_path, graph)
+        for file_name in os.listdir(self.cache.directory):
+            if file_name.endswith('.pickle'):
+                os.remove(os.path.join(self.cache.directory, file_name))
+        self.assertIsNone(self.cache.get(graph_file_path))
+        self.cache.evict()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
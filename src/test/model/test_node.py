@@ -16,3 +16,11 @@ class TestMethods(unittest.TestCase):
     def test_str(self):
         n = DummyNode(['TEST:1'], ['test name'])
         self.assertEqual(str(n), 'DummyNode={ids: [TEST:1], names: ["test name"]}')
+
+    def test_cached_id(self):
+        n = DummyNode(['OTHER:1'], [])
+        self.assertEqual(n.label_id, 'DummyNode|OTHER:1')
+        n.merge(DummyNode(['TEST:2'], []))
+        self.assertEqual(n.id, 'TEST:2')
+        self.assertEqual(n.label_id, 'DummyNode|TEST:2')
+        self.assertFalse(hasattr(node.Node([], []), '__dict__'))
@@ -0,0 +1,64 @@
+import unittest
+from model import registry
+from model.node import Node
+from model.mirna import MiRNA
+from model.gene import Gene
+
+
+class ConstructedNode(Node):
+    def __init__(self, ids: [str], names: [str]):
+        super().__init__(ids, names)
+        self.primary_id_prefix = 'TEST'
+        self.attributes['checked'] = True
+
+
+class SlottedGene(Gene):
+    __slots__ = ('checked',)
+
+    def __init__(self, ids: [str], names: [str]):
+        super().__init__(ids, names)
+        if not ids:
+            raise ValueError('ids required')
+        self.checked = True
+
+
+class TestMethods(unittest.TestCase):
+    def test_get_node_class(self):
+        self.assertEqual(registry.get_node_class('MiRNA;RNA'), MiRNA)
+        self.assertEqual(registry.get_node_class('Gene', 'model.gene'), Gene)
+        self.assertIsNone(registry.get_node_class('Unknown'))
+
+    def test_create_nodes(self):
+        node_types = {'Gene': 'model.gene', 'MiRNA;RNA': 'model.mirna'}
+        nodes = registry.create_nodes([
+            {'_id': 'HGNC:1', '_label': 'Gene', 'ids': ['HGNC:1'], 'names': ['A'], 'source': 'x'},
+            {'_id': 'MIRBASE:1', '_label': 'MiRNA;RNA', 'ids': ['MIRBASE:1'], 'names': []},
+            {'_id': '1', '_label': 'Unknown', 'ids': ['1'], 'names': []}
+        ], node_types)
+        self.assertEqual([type(x) for x in nodes], [Gene, MiRNA])
+        self.assertEqual(nodes[0].attributes, {'source': 'x'})
+        self.assertEqual((nodes[0].id, nodes[0].label_id), ('HGNC:1', 'Gene|HGNC:1'))
+        self.assertEqual(nodes[1].primary_id_prefix, 'URS')
+        self.assertEqual(str(nodes[1]), str(MiRNA(['MIRBASE:1'], [])))
+
+    def test_create_nodes_constructor(self):
+        # Classes setting up more than the primary id prefix are still created through their constructor
+        registry.register_node_class(ConstructedNode)
+        nodes = registry.create_nodes([{'_id': 'TEST:1', '_label': 'ConstructedNode', 'ids': ['TEST:1'], 'names': [],
+                                        'source': 'x'}], {})
+        self.assertEqual(nodes[0].attributes, {'checked': True, 'source': 'x'})
+        self.assertEqual(nodes[0].__dict__, {})
+        # Subclasses of bulk created classes do not inherit the marker and are never built as a prototype
+        registry.register_node_class(SlottedGene)
+        nodes = registry.create_nodes([{'_id': 'HGNC:1', '_label': 'SlottedGene;Gene', 'ids': ['HGNC:1'],
+                                        'names': []}], {})
+        self.assertTrue(nodes[0].checked)
+
+    def test_bulk_prefix(self):
+        # The declared bulk prefix has to match the prefix set by the constructor
+        for class_ in set(registry._node_classes.values()):
+            prefix = registry.get_bulk_prefix(class_)
+            if prefix is not None:
+                self.assertEqual(class_(['X:1'], []).primary_id_prefix, prefix)
+                self.assertEqual(str(class_.create(['X:1'], [], prefix)), str(class_(['X:1'], [])))
+        self.assertIsNone(registry.get_bulk_prefix(SlottedGene))
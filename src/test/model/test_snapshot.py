@@ -0,0 +1,80 @@
+import os
+import json
+import unittest
+from model import node, edge, network, snapshot, sqlite_network
+
+
+class DummyNode(node.Node):
+    def __init__(self, ids: [str], names: [str]):
+        super().__init__(ids, names)
+        self.primary_id_prefix = 'TEST'
+
+
+class DummySubNode(DummyNode):
+    pass
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.temp_file_path = 'genconet_testgraph.snapshot'
+
+    def test_snapshot(self):
+        n1 = DummyNode(['TEST:1', 'OTHER:1'], ['first', 'erste'])
+        n1.attributes['values'] = [1, 'a']
+        n2 = DummySubNode(['TEST:2'], ['second'])
+        n3 = DummyNode(['TEST:3'], [])
+        graph = network.Network()
+        for n in [n1, n2, n3]:
+            graph.add_node(n)
+        graph.add_edge(edge.Edge(n1, n2, 'LINKS', {'source': 'x'}))
+        graph.add_edge(edge.Edge(n3, ('OTHER:1', 'DummyNode'), 'LINKS', {}))
+        graph.add_edge(edge.Edge(n1, n3, 'TARGETS', {'actions': ['a']}))
+        snapshot.write_snapshot(graph, self.temp_file_path)
+        with snapshot.Snapshot(self.temp_file_path) as s:
+            self.assertEqual((s.node_count, s.edge_count), (3, 3))
+            self.assertEqual(s.node_labels(), ['DummyNode', 'DummySubNode;DummyNode'])
+            self.assertEqual(s.edge_labels(), ['LINKS', 'TARGETS'])
+            self.assertEqual(len(s.get_nodes_by_label('DummyNode')), 3)
+            node_1 = s.get_node_by_id('OTHER:1', 'DummyNode')
+            self.assertEqual(str(node_1), str(n1))
+            self.assertEqual(node_1.attributes, {'values': [1, 'a']})
+            self.assertIs(s.get_node_by_id('TEST:1', 'DummyNode'), node_1)
+            self.assertIsNone(s.get_node_by_id('TEST:4', 'DummyNode'))
+            self.assertEqual(len(s.get_node_edges_by_label(node_1, 'LINKS')), 2)
+            node_2 = s.get_node_by_id('TEST:2', 'DummySubNode;DummyNode')
+            self.assertIsInstance(node_2, DummySubNode)
+            self.assertEqual(len(s.get_edges_from_to(node_1, node_2, 'LINKS')), 1)
+            self.assertEqual(len(s.get_edges_from_to(node_2, node_1, 'LINKS')), 0)
+            self.assertEqual(s.get_edges_by_label('TARGETS')[0].attributes, {'actions': ['a']})
+            # Records are grouped by label in the snapshot, so only their content is compared
+            loaded = s.to_network()
+            for key in ['nodes', 'edges']:
+                self.assertEqual(sorted(json.dumps(x, sort_keys=True) for x in loaded.to_dict()[key]),
+                                 sorted(json.dumps(x, sort_keys=True) for x in graph.to_dict()[key]))
+
+    def test_snapshot_sqlite(self):
+        graph = sqlite_network.SqliteNetwork(':memory:')
+        n1 = DummyNode(['TEST:1'], ['first'])
+        n2 = DummySubNode(['TEST:2'], ['second'])
+        graph.add_node(n1)
+        graph.add_node(n2)
+        graph.add_node(DummyNode(['TEST:1', 'OTHER:1'], []))
+        graph.add_edge(edge.Edge(n1, n2, 'LINKS', {'source': 'x'}))
+        graph.add_edge(edge.Edge(n2, ('OTHER:1', 'DummyNode'), 'LINKS', {}))
+        graph.add_edge(edge.Edge(n2, ('TEST:3', 'DummyNode'), 'LINKS', {}))
+        snapshot.write_snapshot(graph, self.temp_file_path)
+        with snapshot.Snapshot(self.temp_file_path) as s:
+            self.assertEqual((s.node_count, s.edge_count), (2, 3))
+            node_1 = s.get_node_by_id('OTHER:1', 'DummyNode')
+            node_2 = s.get_node_by_id('TEST:2', 'DummySubNode;DummyNode')
+            self.assertEqual(len(s.get_node_edges_by_label(node_1, 'LINKS')), 2)
+            self.assertEqual(len(s.get_edges_from_to(node_2, node_1, 'LINKS')), 1)
+            loaded = s.to_network()
+            for key in ['nodes', 'edges']:
+                self.assertEqual(sorted(json.dumps(x, sort_keys=True) for x in loaded.to_dict()[key]),
+                                 sorted(json.dumps(x, sort_keys=True) for x in graph.to_dict()[key]))
+        graph.close()
+
+    def tearDown(self):
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
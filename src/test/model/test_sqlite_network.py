@@ -0,0 +1,104 @@
+import unittest
+from model import node, edge, network, sqlite_network
+
+
+class DummyNode1(node.Node):
+    def __init__(self, ids: [str], names: [str]):
+        super().__init__(ids, names)
+        self.primary_id_prefix = 'TEST1'
+
+
+class DummyNode2(node.Node):
+    def __init__(self, ids: [str], names: [str]):
+        super().__init__(ids, names)
+        self.primary_id_prefix = 'OTHER'
+
+
+class TestMethods(unittest.TestCase):
+    def test_identity_resolution(self):
+        graph = sqlite_network.SqliteNetwork(':memory:')
+        graph.add_node(DummyNode1(['TEST1:1', 'OTHER:a'], ['a']))
+        graph.add_node(DummyNode1(['OTHER:b'], ['b']))
+        graph.add_node(DummyNode1(['OTHER:b', 'OTHER:a'], ['c']))
+        graph.add_node(DummyNode1(['OTHER:c'], []))
+        self.assertEqual(len(list(graph.get_nodes())), 2)
+        self.assertEqual(graph.get_canonical_label_id('DummyNode1|OTHER:b'), 'DummyNode1|TEST1:1')
+        node = graph.get_node_by_id('OTHER:a', 'DummyNode1')
+        self.assertEqual(node.ids, {'TEST1:1', 'OTHER:a', 'OTHER:b'})
+        self.assertEqual(node.names, {'a', 'b', 'c'})
+        node.names.add('d')
+        graph.update_node(node)
+        self.assertEqual(graph.get_node_by_id('OTHER:b', 'DummyNode1').names, {'a', 'b', 'c', 'd'})
+        graph.delete_node(node)
+        self.assertIsNone(graph.get_node_by_id('TEST1:1', 'DummyNode1'))
+        self.assertEqual(graph.get_node_count(), 1)
+        # The views read single rows instead of loading the whole network
+        self.assertEqual(len(graph.nodes), 1)
+        self.assertEqual(list(graph.nodes), ['DummyNode1|OTHER:c'])
+        self.assertEqual(graph.nodes['DummyNode1|OTHER:c'].ids, {'OTHER:c'})
+        self.assertNotIn('DummyNode1|TEST1:1', graph.nodes)
+        self.assertEqual(list(graph._get_root_degrees().values()), [0])
+        self.assertEqual(len(graph.edges), 0)
+        graph.close()
+
+    def test_matches_memory(self):
+        graphs = [network.Network(), sqlite_network.SqliteNetwork(':memory:')]
+        for graph in graphs:
+            n1 = DummyNode1(['TEST1:1'], ['a'])
+            n2 = DummyNode2(['OTHER:2'], [])
+            graph.add_node(n1)
+            graph.add_node(n2)
+            graph.add_node(DummyNode2(['OTHER:3'], []))
+            graph.add_edge(edge.Edge(n1, n2, 'LINKS', {'actions': ['a'], 'source': 'x'}))
+            graph.add_edge(edge.Edge(n1, n2, 'LINKS', {'source': 'x', 'actions': ['a']}))
+            graph.add_edge(edge.Edge(n1, n2, 'LINKS', {'source': 'y'}))
+            graph.add_edge(edge.Edge(n2, n1, 'OTHER', {}))
+            graph.add_node(DummyNode1(['TEST1:1', 'OTHER:1'], ['b']))
+            self.assertEqual(graph.merge_duplicate_edges(), {'LINKS': 1, 'OTHER': 0})
+            self.assertEqual(len(graph.get_edges_from_to(n1, n2, 'LINKS')), 2)
+            self.assertEqual(len(graph.get_node_edges_by_label(n2, 'LINKS')), 2)
+            index = graph.build_adjacency_index()
+            self.assertEqual(index.degree(graph.get_node_by_id('OTHER:1', 'DummyNode1'), 'LINKS'), 2)
+            self.assertEqual(len(graph.edges), 3)
+            self.assertEqual(sorted(graph.edges), [e.id for e in graph.get_edges()])
+            self.assertEqual(graph.edges[next(iter(graph.edges))].label, 'LINKS')
+            self.assertEqual(sorted(graph.get_node_degrees().values()), [0, 3, 3])
+            graph.prune()
+        self.assertEqual(graphs[1].to_dict(), graphs[0].to_dict())
+        self.assertEqual(graphs[1].get_canonical_label_ids(), graphs[0].get_canonical_label_ids())
+        for graph in graphs:
+            self.assertEqual([(e.attributes, source, target) for e, source, target in
+                              graph.iterate_resolved_edges('LINKS')],
+                             [({'actions': ['a'], 'source': 'x'}, 'DummyNode1|TEST1:1', 'DummyNode2|OTHER:2'),
+                              ({'source': 'y'}, 'DummyNode1|TEST1:1', 'DummyNode2|OTHER:2')])
+            self.assertEqual([x.id for x in graph.iterate_nodes_by_label('DummyNode1')], ['TEST1:1'])
+            self.assertEqual(graph.get_node_attribute_keys('DummyNode1'), [])
+        self.assertEqual(graphs[1].edge_labels(), ['LINKS', 'OTHER'])
+        self.assertEqual(len(graphs[1].get_nodes_by_label('DummyNode1')), 1)
+
+    def test_merge_duplicate_edges_unresolved(self):
+        for graph in [network.Network(), sqlite_network.SqliteNetwork(':memory:')]:
+            n1 = DummyNode1(['TEST1:1'], [])
+            graph.add_node(n1)
+            # Neither target is added, the edges must not be merged as they may point to different nodes later
+            graph.add_edge(edge.Edge(n1, DummyNode2(['OTHER:1'], []), 'LINKS', {'source': 'x'}))
+            graph.add_edge(edge.Edge(n1, DummyNode2(['OTHER:2'], []), 'LINKS', {'source': 'x'}))
+            graph.add_edge(edge.Edge(n1, DummyNode2(['OTHER:2'], []), 'LINKS', {'source': 'x'}))
+            self.assertEqual(graph.merge_duplicate_edges(), {'LINKS': 1})
+            self.assertEqual(sorted([e.target_node_id for e in graph.get_edges()]), ['OTHER:1', 'OTHER:2'])
+
+    def test_detach_nodes(self):
+        graphs = [network.Network(), sqlite_network.SqliteNetwork(':memory:')]
+        for graph in graphs:
+            n1 = DummyNode1(['TEST1:1', 'OTHER:1'], ['a'])
+            n2 = DummyNode2(['OTHER:2'], [])
+            graph.add_node(n1)
+            graph.add_node(n2)
+            graph.add_edge(edge.Edge(n1, n2, 'LINKS', {}))
+            self.assertEqual(graph.detach_nodes(['DummyNode1|OTHER:1']), {'DummyNode1|TEST1:1', 'DummyNode1|OTHER:1'})
+            self.assertIsNone(graph.get_node_by_id('TEST1:1', 'DummyNode1'))
+            self.assertEqual(graph.get_node_count(), 1)
+            self.assertEqual(graph.get_edge_count(), 1)
+            graph.add_node(DummyNode1(['TEST1:1'], ['b']))
+            self.assertEqual(len(graph.get_edges_from_to(n1, n2, 'LINKS')), 1)
+        self.assertEqual(graphs[1].to_dict(), graphs[0].to_dict())
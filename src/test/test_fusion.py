@@ -0,0 +1,95 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import fusion
+from model.network import Network
+from model.sqlite_network import SqliteNetwork
+from model.edge import Edge
+from model.gene import Gene
+from model.drug import Drug
+from utils.profiling import Profiler
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def create_graphs(self) -> [str]:
+        graphs = []
+        for i in range(0, 2):
+            graph = Network()
+            graph.add_node(Gene(['HGNC:%s' % i], []))
+            graph.add_node(Drug(['DrugBank:DB%s' % i], []))
+            graph.add_edge(Edge(Drug(['DrugBank:DB%s' % i], []), Gene(['HGNC:%s' % i], []), 'TARGETS', {}))
+            graphs.append(os.path.join(self.directory, 'graph%s.json' % i))
+            graph.save(graphs[-1])
+        return graphs
+
+    def test_load_graphs_profile(self):
+        graphs = self.create_graphs()
+        reports = []
+        for workers in [1, 2]:
+            network = Network()
+            profiler = Profiler()
+            fusion.load_graphs(network, graphs, workers, profiler=profiler)
+            self.assertEqual((network.get_node_count(), network.get_edge_count()), (4, 2))
+            reports.append(profiler.sources)
+        # Both modes measure the load where it happens and the merge in this process
+        for sources in reports:
+            self.assertEqual([x['graph'] for x in sources], graphs)
+            self.assertEqual([(x['load']['nodes'], x['load']['edges']) for x in sources], [(2, 1), (2, 1)])
+            self.assertEqual([(x['merge']['nodes'], x['merge']['edges']) for x in sources], [(2, 1), (4, 2)])
+        self.assertEqual([sorted(x['load'].keys()) for x in reports[0]], [sorted(x['load'].keys()) for x in reports[1]])
+        self.assertEqual([sorted(x['merge'].keys()) for x in reports[0]],
+                         [sorted(x['merge'].keys()) for x in reports[1]])
+        self.assertNotEqual(reports[1][0]['load']['pid'], os.getpid())
+
+    def test_load_graphs_incremental(self):
+        graphs = self.create_graphs()
+        state_path = os.path.join(self.directory, 'state', 'fusion-state.pickle')
+        network = fusion.load_graphs_incremental(graphs, 1, state_path)
+        self.assertEqual((network.get_node_count(), network.get_edge_count()), (4, 2))
+        # Unchanged graphs leave the persisted state untouched
+        os.utime(state_path, (0, 0))
+        network = fusion.load_graphs_incremental(graphs, 1, state_path)
+        self.assertEqual((network.get_node_count(), network.get_edge_count()), (4, 2))
+        self.assertEqual(os.stat(state_path).st_mtime, 0)
+        network = fusion.load_graphs_incremental(graphs[:1], 1, state_path)
+        self.assertEqual((network.get_node_count(), network.get_edge_count()), (2, 1))
+        self.assertNotEqual(os.stat(state_path).st_mtime, 0)
+
+    def test_save_network_sqlite(self):
+        files = []
+        for graph in [Network(), SqliteNetwork(':memory:')]:
+            for i in range(0, 3):
+                gene = Gene(['HGNC:%s' % i], ['Gene %s' % i, 'gene %s' % i])
+                gene.attributes['chr'] = str(i)
+                graph.add_node(gene)
+                graph.add_edge(Edge(Drug(['DrugBank:DB1'], []), Gene(['HGNC:%s' % i], []), 'TARGETS',
+                                    {'source': 'x', 'actions': []}))
+            graph.add_node(Drug(['DrugBank:DB1'], ['aspirin']))
+            # Names are normalized in more than one batch
+            batch_size = fusion.NAME_BATCH_SIZE
+            fusion.NAME_BATCH_SIZE = 2
+            try:
+                self.assertEqual(fusion.merge_duplicate_node_names(graph), 3)
+            finally:
+                fusion.NAME_BATCH_SIZE = batch_size
+            output_path = os.path.join(self.directory, type(graph).__name__)
+            os.makedirs(output_path)
+            fusion.save_network(graph, {'output-path': output_path, 'export-workers': 2, 'Neo4j': {
+                'bin-path': '', 'database-path': '', 'database-name': 'graph.db', 'user': '', 'password': ''}})
+            contents = {}
+            for name in ['nodes_Gene.csv', 'nodes_Drug.csv', 'rel_TARGETS.csv']:
+                with io.open(os.path.join(output_path, name), 'r', encoding='utf-8') as f:
+                    contents[name] = sorted(f.read().splitlines())
+            files.append(contents)
+            graph.close()
+        self.assertEqual(files[1], files[0])
+        self.assertIn('Gene|HGNC:1,HGNC:1,HGNC:1,Gene 1,1,Gene', files[0]['nodes_Gene.csv'])
+        self.assertIn('Drug|DrugBank:DB1,x,,,,Gene|HGNC:2,TARGETS', files[0]['rel_TARGETS.csv'])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
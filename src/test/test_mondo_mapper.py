@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+import mondo_mapper
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        lookup = {
+            'MONDO:1': {'label': 'a', 'refs': ['OMIM:1', 'DO:1']},
+            'MONDO:2': {'label': 'b', 'refs': ['DO:1', 'MeSH:2']},
+            'MONDO:3': {'label': 'c', 'refs': ['UMLS:3']},
+            'MONDO:4': {'label': 'd', 'refs': ['MeSH:2', 'UMLS:4']}
+        }
+        reverse_lookup = {}
+        for mondo_id in lookup:
+            for reference in lookup[mondo_id]['refs']:
+                reverse_lookup.setdefault(reference, []).append(mondo_id)
+        mondo_mapper._index = mondo_mapper.MondoIndex.from_lookups(lookup, reverse_lookup)
+
+    def test_map_from(self):
+        self.assertEqual(mondo_mapper.map_from('DO:1'), (['DO:1', 'MeSH:2', 'OMIM:1'], {'a', 'b'}))
+        self.assertEqual(mondo_mapper.map_from('UMLS:9'), ([], set()))
+        self.assertEqual(mondo_mapper.map_from_to('OMIM:1', 'DO:'), 'DO:1')
+
+    def test_map_many(self):
+        groups = mondo_mapper.map_many(['DO:1', 'UMLS:4', 'UMLS:3', 'UMLS:9'])
+        self.assertEqual(sorted(groups), [(['DO:1', 'MeSH:2', 'OMIM:1', 'UMLS:4'], {'a', 'b', 'd'}),
+                                          (['UMLS:3'], {'c'})])
+
+    def test_lazy_shards(self):
+        directory = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(directory, 'index.json')
+            mondo_mapper._index.save(file_path)
+            self.assertEqual(sorted(os.listdir(directory)), ['index.json', 'index_DO.json', 'index_MeSH.json',
+                                                             'index_OMIM.json', 'index_UMLS.json'])
+            mondo_mapper._index = mondo_mapper.MondoIndex.load(file_path)
+            self.assertEqual(mondo_mapper._index.shards, {})
+            groups = mondo_mapper.map_many(['DO:1', 'UMLS:9'])
+            self.assertEqual(groups, [(['DO:1', 'MeSH:2', 'OMIM:1'], {'a', 'b'})])
+            # Only the shards of the looked up prefixes are read
+            self.assertEqual(sorted(mondo_mapper._index.shards.keys()), ['DO', 'UMLS'])
+            self.assertEqual(mondo_mapper.map_from_to('OMIM:1', 'DO:'), 'DO:1')
+        finally:
+            shutil.rmtree(directory)
+
+    def tearDown(self):
+        mondo_mapper._index = None
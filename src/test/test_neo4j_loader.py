@@ -0,0 +1,128 @@
+import threading
+import unittest
+import neo4j_loader
+from model.network import Network
+from model.edge import Edge
+from model.gene import Gene
+from model.drug import Drug
+from model.mirna import MiRNA
+
+
+class RecordingResult:
+    def __init__(self, value: int):
+        self.value = value
+
+    def consume(self):
+        pass
+
+    def single(self):
+        return [self.value]
+
+
+class RecordingTransaction:
+    def __init__(self, driver: 'RecordingDriver'):
+        self.driver = driver
+
+    def run(self, query: str, parameters=None) -> RecordingResult:
+        with self.driver.lock:
+            self.driver.queries.append((query, parameters))
+        # Pretend a single batch of stale data has to be deleted
+        deleted = 1 if 'DELETE' in query and self.driver.queries.count((query, parameters)) == 1 else 0
+        return RecordingResult(deleted)
+
+
+class RecordingSession:
+    def __init__(self, driver: 'RecordingDriver'):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def run(self, query: str, parameters=None) -> RecordingResult:
+        return RecordingTransaction(self.driver).run(query, parameters)
+
+    def write_transaction(self, function):
+        return function(RecordingTransaction(self.driver))
+
+
+class RecordingDriver:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queries = []
+
+    def session(self) -> RecordingSession:
+        return RecordingSession(self)
+
+    def get_batches(self, prefix: str):
+        return [(query, parameters['rows']) for query, parameters in self.queries if query.startswith(prefix)]
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.network = Network()
+        drug = Drug(['DrugBank:DB1'], ['aspirin'])
+        self.network.add_node(drug)
+        for i in range(0, 3):
+            self.network.add_node(Gene(['HGNC:%s' % i], []))
+            self.network.add_edge(Edge(drug, Gene(['HGNC:%s' % i], []), 'TARGETS', {
+                'source': 'DrugBank', 'known_action': i == 0, 'actions': ['inhibitor'], 'pmid': 1}))
+        self.network.add_node(MiRNA(['URS:1'], ['hsa-mir-1']))
+        self.network.add_edge(Edge(Gene(['HGNC:0'], []), MiRNA(['URS:1'], []), 'CODES',
+                                   {'source': 'HGNC', 'pmid': '12'}))
+
+    def test_load_network(self):
+        driver = RecordingDriver()
+        neo4j_loader.load_network(self.network, driver, batch_size=2, workers=2, load=7)
+        constraints = [query for query, _ in driver.queries if query.startswith('create constraint')]
+        self.assertEqual(len(constraints), 4)
+        node_batches = sorted(driver.get_batches('UNWIND $rows AS row MERGE'), key=lambda x: (x[0], len(x[1])))
+        self.assertEqual([(x[0], len(x[1])) for x in node_batches], [
+            ('UNWIND $rows AS row MERGE (n:`Drug` {_id: row._id}) SET n = row, n._load = $load', 1),
+            ('UNWIND $rows AS row MERGE (n:`Gene` {_id: row._id}) SET n = row, n._load = $load', 1),
+            ('UNWIND $rows AS row MERGE (n:`Gene` {_id: row._id}) SET n = row, n._load = $load', 2),
+            ('UNWIND $rows AS row MERGE (n:`MiRNA` {_id: row._id}) SET n = row, n._load = $load SET n:`RNA`', 1)
+        ])
+        self.assertEqual(node_batches[0][1][0], {'_id': 'DrugBank:DB1', 'label_id': 'Drug|DrugBank:DB1',
+                                                 'ids': ['DrugBank:DB1'], 'names': ['aspirin']})
+        self.assertTrue(all([x[1]['load'] == 7 for x in driver.queries if x[0].startswith('UNWIND')]))
+        # Relationships are merged once all nodes are loaded, stale data is only deleted at the very end
+        first_relationship = min([i for i, x in enumerate(driver.queries) if 'MATCH (s:' in x[0]])
+        last_relationship = max([i for i, x in enumerate(driver.queries) if 'MATCH (s:' in x[0]])
+        self.assertTrue(all(['MERGE (n:' not in x[0] for x in driver.queries[first_relationship:]]))
+        self.assertTrue(all(['DELETE' not in x[0] for x in driver.queries[:last_relationship]]))
+        targets = driver.get_batches('UNWIND $rows AS row MATCH (s:`Drug` {_id: row.source}), (t:`Gene`')
+        self.assertEqual(sorted([len(rows) for _, rows in targets]), [1, 2])
+        self.assertIn('MERGE (s)-[r:`TARGETS` {_key: row.key}]->(t)', targets[0][0])
+        rows = sorted([row for _, x in targets for row in x], key=lambda x: x['target'])
+        properties = {'source': 'DrugBank', 'known_action': True, 'actions': ['inhibitor']}
+        self.assertEqual(rows[0], {'source': 'DrugBank:DB1', 'target': 'HGNC:0', 'properties': properties,
+                                   'key': neo4j_loader.get_relationship_key(properties)})
+        self.assertFalse(rows[1]['properties']['known_action'])
+        self.assertNotEqual(rows[0]['key'], rows[1]['key'])
+        codes = driver.get_batches('UNWIND $rows AS row MATCH (s:`Gene` {_id: row.source}), (t:`MiRNA`')
+        self.assertEqual(codes[0][1][0]['properties'], {'source': 'HGNC', 'pmid': 12})
+
+    def test_delete_stale(self):
+        driver = RecordingDriver()
+        neo4j_loader.load_network(self.network, driver, batch_size=2, workers=1, load=7)
+        deletes = [x for x in driver.queries if 'DELETE' in x[0]]
+        self.assertEqual(deletes, [
+            ('MATCH ()-[r]->() WHERE coalesce(r._load, -1) <> $load WITH r LIMIT $limit DELETE r RETURN count(r)',
+             {'load': 7, 'limit': 2}),
+            ('MATCH ()-[r]->() WHERE coalesce(r._load, -1) <> $load WITH r LIMIT $limit DELETE r RETURN count(r)',
+             {'load': 7, 'limit': 2}),
+            ('MATCH (n) WHERE coalesce(n._load, -1) <> $load WITH n LIMIT $limit DETACH DELETE n RETURN count(n)',
+             {'load': 7, 'limit': 2}),
+            ('MATCH (n) WHERE coalesce(n._load, -1) <> $load WITH n LIMIT $limit DETACH DELETE n RETURN count(n)',
+             {'load': 7, 'limit': 2})
+        ])
+
+    def test_malformed_int(self):
+        self.network.add_edge(Edge(Gene(['HGNC:1'], []), MiRNA(['URS:1'], []), 'CODES',
+                                   {'source': 'HGNC', 'pmid': 'PMC123'}))
+        batches = list(neo4j_loader.get_relationship_batches(self.network, 10))
+        codes = [rows for query, rows in batches if 'CODES' in query][0]
+        self.assertEqual(sorted([x['properties']['pmid'] for x in codes], key=str), [12, 'PMC123'])
@@ -0,0 +1,56 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+import pipeline
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def get_path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def touch(self, name: str, offset: int = 0):
+        with open(self.get_path(name), 'w') as f:
+            f.write(name)
+        os.utime(self.get_path(name), (time.time() + offset, time.time() + offset))
+
+    def test_run_pipeline(self):
+        for name in ['a.py', 'b.py', 'c.py', 'fusion.py', 'a.txt', 'b.txt']:
+            self.touch(name, -100)
+        self.touch('a.graph', -50)
+        stages = [
+            pipeline.Stage(self.get_path('a.py'), [self.get_path('a.txt')], [self.get_path('a.graph')]),
+            pipeline.Stage(self.get_path('b.py'), [self.get_path('b.txt')], [self.get_path('b.graph')]),
+            pipeline.Stage(self.get_path('c.py'), [], [self.get_path('c.graph')]),
+            pipeline.Stage(self.get_path('fusion.py'), [self.get_path(x) for x in ['a.graph', 'b.graph', 'c.graph']],
+                           [self.get_path('graph.json')])
+        ]
+        runs = []
+        failing = {'c'}
+        lock = threading.Lock()
+
+        def runner(stage: pipeline.Stage) -> bool:
+            with lock:
+                runs.append(stage.name)
+            if stage.name in failing:
+                return False
+            for output in stage.outputs:
+                self.touch(os.path.basename(output))
+            return True
+
+        status = pipeline.run_pipeline(stages, 2, runner)
+        self.assertEqual(status, {'a': 'skipped', 'b': 'done', 'c': 'failed', 'fusion': 'blocked'})
+        self.assertEqual(sorted(runs), ['b', 'c'])
+        failing.clear()
+        del runs[:]
+        status = pipeline.run_pipeline(stages, 2, runner)
+        self.assertEqual(status, {'a': 'skipped', 'b': 'skipped', 'c': 'done', 'fusion': 'done'})
+        self.assertEqual(runs, ['c', 'fusion'])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
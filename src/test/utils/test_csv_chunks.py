@@ -0,0 +1,35 @@
+import io
+import csv
+import gzip
+import shutil
+import os
+import tempfile
+import unittest
+from utils.csv_chunks import ChunkedCsvWriter
+
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_single_file(self):
+        with ChunkedCsvWriter(self.directory, 'nodes_Gene', ['a', 'b']) as writer:
+            writer.writerow(['1', None])
+        self.assertEqual(writer.import_argument, 'nodes_Gene.csv')
+        with io.open(os.path.join(self.directory, 'nodes_Gene.csv'), 'r', encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), 'a,b\r\n1,\r\n')
+
+    def test_compressed_chunks(self):
+        with ChunkedCsvWriter(self.directory, 'rel_CODES', ['a', 'b'], compress=True, max_size=1) as writer:
+            for i in range(0, 3):
+                writer.writerow([i, 'x'])
+        self.assertEqual(writer.import_argument, 'rel_CODES_header.csv.gz,rel_CODES_part1.csv.gz,'
+                                                 'rel_CODES_part2.csv.gz,rel_CODES_part3.csv.gz')
+        rows = []
+        for file_name in writer.file_names:
+            with gzip.open(os.path.join(self.directory, file_name), 'rt', encoding='utf-8', newline='') as f:
+                rows.extend(csv.reader(f))
+        self.assertEqual(rows, [['a', 'b'], ['0', 'x'], ['1', 'x'], ['2', 'x']])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
@@ -0,0 +1,20 @@
+import io
+import json
+import unittest
+from utils import json_stream
+
+
+class TestMethods(unittest.TestCase):
+    def test_iterate_object(self):
+        source = {'node_types': {'A': 'model.a'}, 'count': 12345, 'nodes': [{'ids': ['x', 'y"]}'], 'v': 1.5}, [], 7],
+                  'edges': [], 'flag': True}
+        for indent in [None, 2]:
+            text = json.dumps(source, indent=indent)
+            for buffer_size in [1, 3, 1 << 16]:
+                entries = list(json_stream.iterate_object(io.StringIO(text), {'nodes', 'edges'}, buffer_size))
+                self.assertEqual(entries, [('node_types', {'A': 'model.a'}), ('count', 12345),
+                                           ('nodes', {'ids': ['x', 'y"]}'], 'v': 1.5}), ('nodes', []), ('nodes', 7),
+                                           ('flag', True)])
+        self.assertEqual(list(json_stream.iterate_object(io.StringIO(' {} '), set())), [])
+        with self.assertRaises(ValueError):
+            list(json_stream.iterate_object(io.StringIO('{"nodes": [1, 2'), {'nodes'}))
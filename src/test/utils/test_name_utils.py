@@ -16,6 +16,12 @@ class TestMethods(unittest.TestCase):
             {'metabolic disease', 'Metabolic disorder', 'Metabolic Diseases', 'Thesaurismosis',
              'Glucose metabolism abnormal'})
 
+    def test_normalize_node_names_many(self):
+        name_sets = [{'Dicumarol', 'dicumarol'}, {'Xanthinol'}, {'dicumarol', 'Dicumarol'}]
+        expected = [frozenset({'Dicumarol'}), frozenset({'Xanthinol'}), frozenset({'Dicumarol'})]
+        self.assertEqual(name_utils.normalize_node_names_many(name_sets), expected)
+        self.assertEqual(name_utils.normalize_node_names_many(name_sets, 2), expected)
+
     def test_node_names_synonym(self):
         self.assertFalse(name_utils.node_names_synonym({'Dicumarol', 'Xanthinol'}))
         self.assertTrue(name_utils.node_names_synonym({'Xanthinol', 'xanthinol'}))
@@ -0,0 +1,48 @@
+import io
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from model.network import Network
+from model.gene import Gene
+from utils.profiling import Profiler, measure
+
+
+class TestMethods(unittest.TestCase):
+    def test_stages_and_sources(self):
+        network = Network()
+        profiler = Profiler(trace_memory=True)
+        with measure() as load:
+            graph = Network()
+            graph.add_node(Gene(['HGNC:1'], []))
+        profiler.add_source('graph.json', load)
+        with profiler.stage('load', network) as record:
+            with profiler.merge_source('graph.json', network):
+                network.merge(graph)
+            network.add_node(Gene(['HGNC:2'], []))
+        source = profiler.sources[0]
+        self.assertEqual(source['graph'], 'graph.json')
+        self.assertIs(source['load'], load)
+        self.assertEqual((source['merge']['nodes'], source['merge']['edges']), (1, 0))
+        self.assertNotIn('peak_traced_bytes', source['merge'])
+        self.assertEqual(profiler.stages[0]['name'], 'load')
+        self.assertEqual(profiler.stages[0]['nodes'], 2)
+        self.assertEqual(profiler.stages[0]['edges'], 0)
+        self.assertGreaterEqual(profiler.stages[0]['wall_seconds'], 0)
+        self.assertIn('peak_traced_bytes', profiler.stages[0])
+
+    def test_save(self):
+        directory = tempfile.mkdtemp()
+        try:
+            profiler = Profiler()
+            with profiler.stage('prune'):
+                pass
+            file_path = os.path.join(directory, 'profile.json')
+            profiler.save(file_path)
+            with io.open(file_path, 'r', encoding='utf-8', newline='') as f:
+                report = json.load(f)
+            self.assertEqual([x['name'] for x in report['stages']], ['prune'])
+            self.assertEqual(report['sources'], [])
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,17 @@
+import unittest
+from utils.union_find import UnionFind
+
+
+class TestMethods(unittest.TestCase):
+    def test_union_find(self):
+        sets = UnionFind()
+        for x in ['a', 'b', 'c', 'd']:
+            sets.add(x)
+        sets.union('a', 'b')
+        sets.union('c', 'b')
+        self.assertEqual(sets.find('a'), sets.find('c'))
+        self.assertNotEqual(sets.find('a'), sets.find('d'))
+        self.assertEqual(sets.size('c'), 3)
+        sets.remove(['a', 'b', 'c'])
+        self.assertNotIn('a', sets)
+        self.assertEqual(len(sets), 1)
@@ -5,6 +5,7 @@ import urllib.request
 import gzip
 import io
 import csv
+from utils import graph_utils
 from model.network import Network
 from model.gene import Gene
 
@@ -35,4 +36,4 @@ with io.open(id_mapping_file, 'r', encoding='utf-8', newline='') as f:
             gene = Gene(['UniProtKB:%s' % row[0], 'HGNC:%s' % row[2]], [])
             network.add_node(gene)
 
-network.save('../data/UniprotKB/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/UniprotKB'))
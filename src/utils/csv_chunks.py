@@ -0,0 +1,67 @@
+import io
+import os
+import csv
+import gzip
+from typing import List, Any, BinaryIO
+
+
+class ChunkedCsvWriter:
+    def __init__(self, directory: str, name: str, header: List[str], compress: bool = False, max_size: int = 0):
+        # Without compression and size limit a single csv file including the header is written. Otherwise the
+        # header is written to its own file, followed by as many parts as needed to keep each below max_size bytes.
+        self.directory = directory
+        self.name = name
+        self.compress = compress
+        self.max_size = max_size
+        self.file_names: List[str] = []
+        self._raw_file: BinaryIO or None = None
+        self._file = None
+        self._writer = None
+        self._rows = 0
+        if not compress and max_size <= 0:
+            self._open('%s.csv' % name)
+            self._writer.writerow(header)
+        else:
+            self._open('%s_header%s' % (name, self._get_extension()))
+            self._writer.writerow(header)
+            self._close()
+            self._open('%s_part1%s' % (name, self._get_extension()))
+
+    def _get_extension(self) -> str:
+        return '.csv.gz' if self.compress else '.csv'
+
+    def _open(self, file_name: str):
+        self.file_names.append(file_name)
+        self._raw_file = io.open(os.path.join(self.directory, file_name), 'wb')
+        binary_file = gzip.GzipFile(fileobj=self._raw_file, mode='wb') if self.compress else self._raw_file
+        self._file = io.TextIOWrapper(binary_file, encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file, delimiter=',', quotechar='"')
+        self._rows = 0
+
+    def _close(self):
+        self._file.close()
+        if self.compress:
+            self._raw_file.close()
+
+    def writerow(self, row: List[Any]):
+        # The size of the raw file lags behind by the text and compression buffers, so parts may slightly exceed
+        # the limit. A part always holds at least one row.
+        if 0 < self.max_size <= self._raw_file.tell() and self._rows > 0:
+            self._close()
+            self._open('%s_part%s%s' % (self.name, len(self.file_names), self._get_extension()))
+        self._writer.writerow(row)
+        self._rows += 1
+
+    def close(self):
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def import_argument(self) -> str:
+        # neo4j-admin import reads a header file followed by the data files from a comma separated list
+        return ','.join(self.file_names)
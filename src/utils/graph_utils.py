@@ -0,0 +1,34 @@
+import io
+import os
+import json
+
+GRAPH_FORMATS = ['json', 'jsonl']
+config_file_path = '../data/config.json'
+_graph_format = None
+
+
+def get_graph_format() -> str:
+    global _graph_format
+    if _graph_format is None:
+        _graph_format = 'json'
+        if os.path.exists(config_file_path):
+            with io.open(config_file_path, 'r', encoding='utf-8', newline='') as f:
+                config = json.load(f)
+            if 'graph-format' in config:
+                _graph_format = config['graph-format']
+        if _graph_format not in GRAPH_FORMATS:
+            raise ValueError('Unknown graph format "%s", expected one of %s' % (_graph_format, GRAPH_FORMATS))
+    return _graph_format
+
+
+def get_graph_file_path(directory: str) -> str:
+    return os.path.join(directory, 'graph.%s' % get_graph_format())
+
+
+def find_graph_file_path(directory: str) -> str:
+    # Prefer the configured format, but accept graphs that were saved in any other format
+    for graph_format in [get_graph_format()] + GRAPH_FORMATS:
+        file_path = os.path.join(directory, 'graph.%s' % graph_format)
+        if os.path.exists(file_path):
+            return file_path
+    return get_graph_file_path(directory)
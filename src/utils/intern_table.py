@@ -0,0 +1,27 @@
+from typing import Dict, List
+
+
+class InternTable:
+    def __init__(self):
+        self.indices: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.indices
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def intern(self, value: str) -> int:
+        index = self.indices.get(value)
+        if index is None:
+            index = len(self.values)
+            self.indices[value] = index
+            self.values.append(value)
+        return index
+
+    def get(self, value: str) -> int or None:
+        return self.indices.get(value)
+
+    def lookup(self, index: int) -> str:
+        return self.values[index]
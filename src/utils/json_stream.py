@@ -0,0 +1,114 @@
+import json
+from typing import Any, List, Tuple, Iterator, TextIO, Set
+
+
+def write_object(f: TextIO, entries: List[Tuple[str, Any]], indent: int or None = None,
+                 separators: Tuple[str, str] or None = None):
+    # Writes the same text as json.dump of the equivalent dict. Iterator values are written as arrays one item at a
+    # time, so they never have to be held in memory completely.
+    if separators is None:
+        separators = (', ', ': ') if indent is None else (',', ': ')
+    item_separator, key_separator = separators
+    if not entries:
+        f.write('{}')
+        return
+    f.write('{')
+    for i, (key, value) in enumerate(entries):
+        if i > 0:
+            f.write(item_separator)
+        f.write(_get_newline(indent, 1) + json.dumps(key) + key_separator)
+        if isinstance(value, Iterator):
+            empty = True
+            for item in value:
+                f.write('[' if empty else item_separator)
+                f.write(_get_newline(indent, 2) + _dumps(item, indent, separators, 2))
+                empty = False
+            f.write('[]' if empty else _get_newline(indent, 1) + ']')
+        else:
+            f.write(_dumps(value, indent, separators, 1))
+    f.write(_get_newline(indent, 0) + '}')
+
+
+def _get_newline(indent: int or None, level: int) -> str:
+    return '' if indent is None else '\n' + ' ' * (indent * level)
+
+
+def _dumps(value: Any, indent: int or None, separators: Tuple[str, str], level: int) -> str:
+    text = json.dumps(value, indent=indent, separators=separators)
+    # Line breaks only occur between tokens, as json.dumps escapes them inside of strings
+    return text if indent is None else text.replace('\n', _get_newline(indent, level))
+
+
+def iterate_object(f: TextIO, stream_keys: Set[str], buffer_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    # Yields the (key, value) entries of a top level JSON object. Array values of the stream keys are yielded as one
+    # (key, item) entry per item, so only a single item has to be decoded and held in memory at a time.
+    reader = _Reader(f, buffer_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.expect('}')
+        return
+    while True:
+        key = reader.decode()
+        reader.expect(':')
+        if key in stream_keys and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.expect(']')
+            else:
+                while True:
+                    yield key, reader.decode()
+                    if reader.expect(',]') == ']':
+                        break
+        else:
+            yield key, reader.decode()
+        if reader.expect(',}') == '}':
+            break
+
+
+class _Reader:
+    def __init__(self, f: TextIO, buffer_size: int):
+        self.f = f
+        self.buffer_size = buffer_size
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        # Grow the chunk with the pending data so that large values are not decoded again and again
+        chunk = self.f.read(max(self.buffer_size, len(self.buffer) - self.position))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in ' \t\n\r':
+                self.position += 1
+            if self.position < len(self.buffer) or not self._fill():
+                return self.buffer[self.position:self.position + 1]
+
+    def expect(self, characters: str) -> str:
+        c = self.peek()
+        if not c or c not in characters:
+            raise ValueError('Expected one of "%s" but found "%s"' % (characters, c))
+        self.position += 1
+        return c
+
+    def decode(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # A value ending with the buffer may be a truncated number or literal
+                if end < len(self.buffer) or not self._fill():
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
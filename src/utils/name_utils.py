@@ -1,6 +1,7 @@
 import re
 import difflib
-from typing import Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import Set, List, Dict, FrozenSet, Iterable
 
 
 def normalize_node_names(names: Set[str]) -> Set[str]:
@@ -30,6 +31,24 @@ def normalize_node_names(names: Set[str]) -> Set[str]:
     return result
 
 
+def normalize_node_names_many(name_sets: Iterable[Set[str]], workers: int = 1) -> List[FrozenSet[str]]:
+    # Name sets repeat heavily across nodes, so every distinct set is only normalized once
+    name_sets = [frozenset(x) for x in name_sets]
+    unique_name_sets = list(dict.fromkeys(name_sets))
+    if workers > 1 and len(unique_name_sets) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_size = max(len(unique_name_sets) // (workers * 4), 1)
+            results = list(executor.map(_normalize_frozen_node_names, unique_name_sets, chunksize=chunk_size))
+    else:
+        results = [_normalize_frozen_node_names(x) for x in unique_name_sets]
+    normalized: Dict[FrozenSet[str], FrozenSet[str]] = dict(zip(unique_name_sets, results))
+    return [normalized[x] for x in name_sets]
+
+
+def _normalize_frozen_node_names(names: FrozenSet[str]) -> FrozenSet[str]:
+    return frozenset(normalize_node_names(set(names)))
+
+
 def node_names_synonym(names: Set[str]) -> bool:
     names = sorted({x.lower() for x in names})
     if len(names) == 1:
@@ -0,0 +1,87 @@
+import io
+import sys
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import List, Dict, Iterator, Any
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, the peak RSS is left out of the report there
+    resource = None
+
+
+def get_peak_rss(children: bool = False) -> int or None:
+    # The peak of the calling process over its whole lifetime. For children it is the largest peak of all terminated
+    # child processes, such as the fusion workers once their pool is shut down.
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes everywhere else
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+
+@contextmanager
+def measure(network=None, trace_memory: bool = False) -> Iterator[Dict[str, Any]]:
+    # Wall and CPU time of the calling process, work done in other processes has to be measured there
+    record = {}
+    if trace_memory:
+        # Restarting the trace resets the peak, tracemalloc.reset_peak is not available before Python 3.9
+        tracemalloc.stop()
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    yield record
+    record['wall_seconds'] = time.perf_counter() - wall_start
+    record['cpu_seconds'] = time.process_time() - cpu_start
+    record['peak_rss_bytes'] = get_peak_rss()
+    if trace_memory:
+        record['peak_traced_bytes'] = tracemalloc.get_traced_memory()[1]
+    if network is not None:
+        record['nodes'] = network.get_node_count()
+        record['edges'] = network.get_edge_count()
+
+
+class Profiler:
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: List[Dict[str, Any]] = []
+        self.sources: List[Dict[str, Any]] = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str, network=None) -> Iterator[Dict[str, Any]]:
+        with measure(network, self.trace_memory) as record:
+            record['name'] = name
+            yield record
+        self.stages.append(record)
+
+    def add_source(self, graph: str, load: Dict[str, Any]):
+        # The load of a source is measured by the process loading it, see measure. Its merge into the fused network
+        # is added by merge_source, sources applied by the incremental fusion state have no merge record.
+        self.sources.append({'graph': graph, 'load': load, 'merge': None})
+
+    @contextmanager
+    def merge_source(self, graph: str, network=None) -> Iterator[Dict[str, Any]]:
+        # Sources are measured within a stage, so they leave the traced memory peak of the stage untouched
+        with measure(network) as record:
+            yield record
+        for source in reversed(self.sources):
+            if source['graph'] == graph:
+                source['merge'] = record
+                break
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'stages': self.stages,
+            'sources': self.sources,
+            'peak_rss_bytes': get_peak_rss(),
+            'peak_children_rss_bytes': get_peak_rss(children=True)
+        }
+
+    def save(self, file_path: str):
+        with io.open(file_path, 'w', encoding='utf-8', newline='') as f:
+            json.dump(self.to_dict(), f, indent=2)
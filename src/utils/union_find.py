@@ -0,0 +1,55 @@
+from typing import Dict, Hashable, Iterable, Iterator
+
+
+class UnionFind:
+    def __init__(self):
+        self.parents: Dict[Hashable, Hashable] = {}
+        self.sizes: Dict[Hashable, int] = {}
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.parents
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.parents)
+
+    def add(self, item: Hashable) -> Hashable:
+        if item not in self.parents:
+            self.parents[item] = item
+            self.sizes[item] = 1
+            return item
+        return self.find(item)
+
+    def find(self, item: Hashable) -> Hashable:
+        parents = self.parents
+        parent = parents[item]
+        while parent != item:
+            # Path halving keeps the trees flat without a second pass
+            grandparent = parents[parent]
+            parents[item] = grandparent
+            item = parent
+            parent = grandparent
+        return item
+
+    def union(self, a: Hashable, b: Hashable) -> Hashable:
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.sizes[root_a] < self.sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parents[root_b] = root_a
+        self.sizes[root_a] += self.sizes.pop(root_b)
+        return root_a
+
+    def size(self, item: Hashable) -> int:
+        return self.sizes[self.find(item)]
+
+    def remove(self, items: Iterable[Hashable]):
+        # The items have to cover complete sets, otherwise remaining members could point to a removed parent
+        for item in items:
+            if item in self.parents:
+                del self.parents[item]
+                self.sizes.pop(item, None)
@@ -5,8 +5,11 @@ import io
 import json
 
 from utils import name_utils
+from utils import graph_utils
 
 from model.network import Network
+from model.network_cache import NetworkCache
+from model.snapshot import Snapshot
 
 
 def node_ids_to_links(node_ids):
@@ -31,10 +34,13 @@ if __name__ == '__main__':
     with io.open('../data/config.json', 'r', encoding='utf-8', newline='') as f:
         config = json.load(f)
 
-    network = Network()
-    with io.open(os.path.join(config['output-path'], 'graph.json'), 'r', encoding='utf-8', newline='') as f:
-        g = json.loads(f.read())
-        network.load_from_dict(g)
+    snapshot_file_path = os.path.join(config['output-path'], 'graph.snapshot')
+    if os.path.exists(snapshot_file_path):
+        network = Snapshot(snapshot_file_path)
+    else:
+        network = Network()
+        network.load(graph_utils.find_graph_file_path(config['output-path']), os.cpu_count(),
+                     NetworkCache.from_config(config))
 
     with io.open(os.path.join(config['output-path'], 'validation_report.html'), 'w', encoding='utf-8', newline='') as f:
         f.write('<!doctype html>\n<html>\n<head>\n</head>\n<body>\n')
@@ -5,6 +5,7 @@ import csv
 import os.path
 import zipfile
 import urllib.request
+from utils import graph_utils
 from model.network import Network
 from model.gene import Gene
 from model.variant import Variant
@@ -79,4 +80,4 @@ with io.open(file_trans, 'r', encoding='utf-8', newline='') as f:
             }
             network.add_edge(Edge(gene, variant, 'EQTL', rel))
 
-network.save('../data/Westra_etal_2017/graph.json')
+network.save(graph_utils.get_graph_file_path('../data/Westra_etal_2017'))